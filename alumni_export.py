@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from sqlalchemy import select
+from models import db, Alumni
+from alumni_queries import apply_alumni_filters, apply_alumni_sort
+
+# Exported columns, in the same order as Alumni.to_dict
+EXPORT_COLUMNS = [
+    'id', 'first_name', 'last_name', 'email', 'phone', 'date_of_birth', 'gender',
+    'degree', 'department', 'graduation_year', 'student_id',
+    'current_employer', 'job_title', 'industry', 'years_of_experience', 'linkedin',
+    'current_city', 'state', 'country',
+    'technical_skills', 'languages_known', 'areas_of_interest',
+]
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# Rows fetched from the cursor and written to the response per step
+BATCH_SIZE = 1000
+
+# Rows per Parquet row group
+PARQUET_ROW_GROUP_SIZE = 10000
+
+
+def _iter_batches(filters):
+    """Yield lists of row tuples for the filtered table using a streaming cursor"""
+    columns = [getattr(Alumni, name) for name in EXPORT_COLUMNS]
+    statement = apply_alumni_sort(apply_alumni_filters(select(*columns), filters), filters)
+    # stream_results asks the driver for a server-side cursor where it has one
+    # (psycopg2 named cursors); SQLite cursors already step lazily.
+    result = db.session.execute(statement, execution_options={'stream_results': True})
+    try:
+        for partition in result.partitions(BATCH_SIZE):
+            yield partition
+    finally:
+        result.close()
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def export_csv(filters):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in _iter_batches(filters):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_ndjson(filters):
+    for batch in _iter_batches(filters):
+        yield ''.join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=_json_default) + '\n'
+            for row in batch
+        )
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _parquet_schema(pa):
+    types = {
+        'id': pa.int64(),
+        'graduation_year': pa.int32(),
+        'years_of_experience': pa.int32(),
+        'date_of_birth': pa.date32(),
+    }
+    return pa.schema([(name, types.get(name, pa.string())) for name in EXPORT_COLUMNS])
+
+
+def export_parquet(filters):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(pa)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    pending = []
+    for batch in _iter_batches(filters):
+        pending.extend(batch)
+        if len(pending) >= PARQUET_ROW_GROUP_SIZE:
+            writer.write_table(pa.Table.from_pylist([dict(zip(EXPORT_COLUMNS, row)) for row in pending], schema=schema))
+            pending = []
+            yield sink.drain()
+    if pending:
+        writer.write_table(pa.Table.from_pylist([dict(zip(EXPORT_COLUMNS, row)) for row in pending], schema=schema))
+    writer.close()
+    yield sink.drain()
+
+
+def parquet_available():
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        return False
+    return True
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'ndjson': export_ndjson,
+    'parquet': export_parquet,
+}
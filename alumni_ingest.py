@@ -0,0 +1,430 @@
+import json
+import sqlite3
+from datetime import datetime
+from sqlalchemy import insert, select, or_
+from sqlalchemy.exc import IntegrityError
+from models import db, Alumni
+from change_tracking import mark_alumni_changed
+from alumni_tags import sync_alumni_tags, sync_alumni_tags_by_email
+from duplicate_filter import duplicate_index
+
+REQUIRED_FIELDS = ['first_name', 'last_name', 'email', 'degree', 'department', 'graduation_year', 'student_id']
+
+# The portal collects a single full name, so a one-word name leaves last_name empty
+PORTAL_REQUIRED_FIELDS = [field for field in REQUIRED_FIELDS if field != 'last_name']
+
+TEXT_FIELDS = [
+    'first_name', 'last_name', 'email', 'phone', 'gender',
+    'degree', 'department', 'student_id',
+    'current_employer', 'job_title', 'industry', 'linkedin',
+    'current_city', 'state', 'country',
+    'technical_skills', 'languages_known', 'areas_of_interest',
+]
+
+DATE_FORMATS = ['%m/%d/%Y', '%Y-%m-%d']
+
+MAX_BULK_ROWS = 50000
+
+# SQLite caps the number of bound parameters per statement
+if sqlite3.sqlite_version_info >= (3, 32, 0):
+    SQLITE_MAX_VARIABLES = 32766
+else:
+    SQLITE_MAX_VARIABLES = 999
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def portal_to_record(data):
+    """Map a registration-portal (camelCase) payload onto Alumni column names"""
+    full_name = (data.get('fullName') or '').strip()
+    if ' ' in full_name:
+        first_name, *last_name_parts = full_name.split(' ')
+        last_name = ' '.join(last_name_parts)
+    else:
+        first_name = full_name
+        last_name = ''
+
+    return {
+        'first_name': first_name,
+        'last_name': last_name,
+        'email': data.get('email', ''),
+        'phone': data.get('phone', ''),
+        'date_of_birth': data.get('dateOfBirth'),
+        'gender': data.get('gender', ''),
+        'degree': data.get('degree', ''),
+        'department': data.get('department', ''),
+        'graduation_year': data.get('graduationYear'),
+        'student_id': data.get('studentId', ''),
+        'current_employer': data.get('company', ''),
+        'job_title': data.get('currentJob', ''),
+        'industry': data.get('industry', ''),
+        'years_of_experience': data.get('yearsOfExperience'),
+        'linkedin': data.get('linkedin', ''),
+        'current_city': data.get('location', ''),
+        'state': data.get('state', ''),
+        'country': data.get('country', ''),
+        'technical_skills': data.get('technicalSkills', ''),
+        'languages_known': data.get('languagesKnown', ''),
+        'areas_of_interest': data.get('interests', ''),
+    }
+
+
+def _parse_int(value):
+    if value is None or value == '':
+        return None
+    return int(value)
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f'unrecognised date {value!r}')
+
+
+def validate_record(data, required=REQUIRED_FIELDS):
+    """Validate one submission-format record.
+
+    Returns (values, errors) where values is a dict of Alumni column values
+    ready for insertion and errors is a list of human-readable messages.
+    """
+    if not isinstance(data, dict):
+        return None, ['record must be a JSON object']
+
+    errors = []
+    values = {}
+
+    for field in TEXT_FIELDS:
+        value = data.get(field)
+        if value is None:
+            value = ''
+        if not isinstance(value, str):
+            value = str(value)
+        value = value.strip()
+        max_length = getattr(Alumni.__table__.c[field].type, 'length', None)
+        if max_length and len(value) > max_length:
+            errors.append(f'{field} exceeds {max_length} characters')
+        values[field] = value
+
+    try:
+        values['graduation_year'] = _parse_int(data.get('graduation_year'))
+    except (TypeError, ValueError):
+        errors.append('graduation_year must be an integer')
+        values['graduation_year'] = None
+
+    try:
+        values['years_of_experience'] = _parse_int(data.get('years_of_experience'))
+    except (TypeError, ValueError):
+        errors.append('years_of_experience must be an integer')
+
+    try:
+        values['date_of_birth'] = _parse_date(data.get('date_of_birth'))
+    except (TypeError, ValueError):
+        errors.append('date_of_birth must be MM/DD/YYYY or YYYY-MM-DD')
+
+    for field in required:
+        if values.get(field) in (None, ''):
+            errors.append(f'{field} is required')
+
+    if values['email'] and '@' not in values['email']:
+        errors.append('email is not valid')
+
+    return values, errors
+
+
+def iter_bulk_records(stream, content_type):
+    """Yield decoded records from an NDJSON stream or a JSON array body"""
+    if 'ndjson' in content_type or 'jsonlines' in content_type:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield ValueError(f'invalid JSON: {e}')
+    else:
+        records = json.loads(stream.read() or b'null')
+        if not isinstance(records, list):
+            raise ValueError('Request body must be a JSON array or NDJSON')
+        for record in records:
+            yield record
+
+
+def chunk_size_for(dialect_name):
+    """Rows per insert batch, bounded by the dialect's parameter limit"""
+    if dialect_name == 'sqlite':
+        # The duplicate probe binds an email and a student id per row
+        return max(1, min(DEFAULT_CHUNK_SIZE, SQLITE_MAX_VARIABLES // 2))
+    return DEFAULT_CHUNK_SIZE
+
+
+def _find_existing(rows):
+    """Return the emails and student ids in rows that are already stored"""
+    # Only rows the duplicate filter cannot rule out need to be looked up
+    rows = [
+        (index, values) for index, values in rows
+        if duplicate_index.might_exist(email=values['email'], student_id=values['student_id'])
+    ]
+    if not rows:
+        return set(), set()
+    emails = [values['email'] for _, values in rows]
+    student_ids = [values['student_id'] for _, values in rows]
+    existing = db.session.execute(
+        select(Alumni.email, Alumni.student_id).where(
+            or_(Alumni.email.in_(emails), Alumni.student_id.in_(student_ids))
+        )
+    ).all()
+    return {email for email, _ in existing}, {student_id for _, student_id in existing}
+
+
+def _insert_chunk(rows, results):
+    """Insert validated rows in one batched statement and commit"""
+    existing_emails, existing_student_ids = _find_existing(rows)
+    pending = []
+    for index, values in rows:
+        if values['email'] in existing_emails:
+            results[index] = {'row': index, 'status': 'duplicate', 'errors': ['email already exists']}
+        elif values['student_id'] in existing_student_ids:
+            results[index] = {'row': index, 'status': 'duplicate', 'errors': ['student_id already exists']}
+        else:
+            pending.append((index, values))
+    if not pending:
+        return
+
+    now = datetime.utcnow()
+    for _, values in pending:
+        values['created_at'] = now
+        values['updated_at'] = now
+
+    try:
+        # executemany form: one cached statement, batched by the driver
+        # (psycopg2 pages it into multi-row VALUES via execute_values)
+        db.session.execute(insert(Alumni.__table__), [values for _, values in pending])
+        sync_alumni_tags_by_email(db.session.connection(), [values['email'] for _, values in pending])
+        mark_alumni_changed()
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent writer got there first; retry row by row to attribute the conflict
+        db.session.rollback()
+        for index, values in pending:
+            try:
+                db.session.execute(insert(Alumni.__table__), values)
+                sync_alumni_tags_by_email(db.session.connection(), [values['email']])
+                mark_alumni_changed()
+                db.session.commit()
+            except IntegrityError as e:
+                db.session.rollback()
+                results[index] = {'row': index, 'status': 'duplicate', 'errors': [str(e.orig)]}
+
+    inserted = [(index, values) for index, values in pending if index not in results]
+    for _, values in pending:
+        duplicate_index.remember(email=values['email'], student_id=values['student_id'])
+    if inserted:
+        ids = dict(db.session.execute(
+            select(Alumni.email, Alumni.id).where(Alumni.email.in_([values['email'] for _, values in inserted]))
+        ).all())
+        for index, values in inserted:
+            results[index] = {'row': index, 'status': 'inserted', 'id': ids.get(values['email'])}
+
+
+def bulk_insert_alumni(records, record_format='submit'):
+    """Validate and insert an iterable of records in chunked batch inserts.
+
+    Returns (summary, results) where results holds one entry per processed
+    row in input order. Processing stops after MAX_BULK_ROWS rows; earlier
+    chunks are already committed by then, so instead of failing the summary
+    reports truncated=True and stopped_at, the index of the first row that
+    was not processed, for the client to resend from.
+    """
+    chunk_size = chunk_size_for(db.engine.dialect.name)
+    results = {}
+    chunk = []
+    seen_emails = set()
+    seen_student_ids = set()
+    total = 0
+    stopped_at = None
+
+    for index, record in enumerate(records):
+        if index >= MAX_BULK_ROWS:
+            stopped_at = index
+            break
+        total += 1
+
+        if isinstance(record, Exception):
+            results[index] = {'row': index, 'status': 'error', 'errors': [str(record)]}
+            continue
+        required = REQUIRED_FIELDS
+        if record_format == 'portal' and isinstance(record, dict):
+            record = portal_to_record(record)
+            required = PORTAL_REQUIRED_FIELDS
+
+        values, errors = validate_record(record, required=required)
+        if not errors:
+            # Reject duplicates within the same upload before they reach the database
+            if values['email'] in seen_emails:
+                errors.append('email is repeated in this upload')
+            elif values['student_id'] in seen_student_ids:
+                errors.append('student_id is repeated in this upload')
+        if errors:
+            results[index] = {'row': index, 'status': 'error', 'errors': errors}
+            continue
+
+        seen_emails.add(values['email'])
+        seen_student_ids.add(values['student_id'])
+        chunk.append((index, values))
+        if len(chunk) >= chunk_size:
+            _insert_chunk(chunk, results)
+            chunk = []
+
+    if chunk:
+        _insert_chunk(chunk, results)
+
+    ordered = [results[index] for index in range(total)]
+    summary = {
+        'total': total,
+        'inserted': sum(1 for result in ordered if result['status'] == 'inserted'),
+        'duplicates': sum(1 for result in ordered if result['status'] == 'duplicate'),
+        'errors': sum(1 for result in ordered if result['status'] == 'error'),
+        'truncated': stopped_at is not None,
+        'stopped_at': stopped_at,
+    }
+    return summary, ordered
+
+
+# Columns copied from Firestore documents; id and timestamps stay database-managed
+SYNC_COLUMNS = TEXT_FIELDS + ['date_of_birth', 'graduation_year', 'years_of_experience']
+
+
+def _coerce_sync_document(document):
+    """Pick the Alumni columns out of a Firestore document and coerce their types"""
+    values = {}
+    for field in SYNC_COLUMNS:
+        if field not in document:
+            continue
+        value = document[field]
+        if field == 'date_of_birth' and isinstance(value, str):
+            value = _parse_date(value)
+        elif field in ('graduation_year', 'years_of_experience'):
+            value = _parse_int(value)
+        values[field] = value
+    if not values.get('email'):
+        raise ValueError('email is required')
+    return values
+
+
+def _sync_upserted_tags(updates, inserts):
+    """Bulk mappings bypass the ORM flush hooks, so rebuild tag links explicitly"""
+    connection = db.session.connection()
+    sync_alumni_tags(connection, [values['id'] for values in updates])
+    sync_alumni_tags_by_email(connection, [values['email'] for values in inserts])
+
+
+def _apply_upsert_chunk(inserts, updates, email_to_id, summary):
+    """Write one chunk of inserts and updates in bulk and commit it"""
+    now = datetime.utcnow()
+    for values in updates:
+        values['updated_at'] = now
+    try:
+        if updates:
+            db.session.bulk_update_mappings(Alumni, updates)
+        if inserts:
+            db.session.bulk_insert_mappings(Alumni, inserts)
+        _sync_upserted_tags(updates, inserts)
+        mark_alumni_changed()
+        db.session.commit()
+        summary['updated'] += len(updates)
+        summary['inserted'] += len(inserts)
+    except IntegrityError:
+        # Fall back to row-at-a-time so one bad row does not sink the chunk
+        db.session.rollback()
+        for values, is_update in [(values, True) for values in updates] + [(values, False) for values in inserts]:
+            try:
+                if is_update:
+                    db.session.bulk_update_mappings(Alumni, [values])
+                    _sync_upserted_tags([values], [])
+                else:
+                    db.session.bulk_insert_mappings(Alumni, [values])
+                    _sync_upserted_tags([], [values])
+                mark_alumni_changed()
+                db.session.commit()
+                summary['updated' if is_update else 'inserted'] += 1
+            except IntegrityError as e:
+                db.session.rollback()
+                summary['errors'] += 1
+                print(f"Error processing alumni {values.get('email', 'unknown')}: {e.orig}")
+
+    for values in inserts + updates:
+        duplicate_index.remember(email=values['email'], student_id=values.get('student_id'))
+
+    if inserts:
+        # Later documents in the same sync may update rows inserted here
+        new_emails = [values['email'] for values in inserts]
+        email_to_id.update(db.session.execute(
+            select(Alumni.email, Alumni.id).where(Alumni.email.in_(new_emails))
+        ).all())
+
+
+def iter_upsert_alumni_by_email(documents, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Insert or update Alumni rows keyed by email, yielding progress per chunk.
+
+    The email -> id map is loaded once up front; each chunk is written with
+    bulk insert/update mappings and committed on its own, so no single
+    transaction holds the write lock for the whole sync. A snapshot of the
+    running summary is yielded after every committed chunk.
+    """
+    email_to_id = dict(db.session.execute(select(Alumni.email, Alumni.id)).all())
+    summary = {'processed': 0, 'inserted': 0, 'updated': 0, 'errors': 0, 'chunks': 0}
+    inserts = []
+    updates = []
+    pending_emails = set()
+
+    def flush():
+        _apply_upsert_chunk(inserts, updates, email_to_id, summary)
+        summary['chunks'] += 1
+        inserts.clear()
+        updates.clear()
+        pending_emails.clear()
+        return dict(summary)
+
+    for document in documents:
+        summary['processed'] += 1
+        try:
+            values = _coerce_sync_document(document)
+        except (TypeError, ValueError) as e:
+            summary['errors'] += 1
+            print(f"Error processing alumni {document.get('email', 'unknown')}: {e}")
+            continue
+
+        if values['email'] in pending_emails:
+            # The same email twice in one chunk: write what we have first
+            yield flush()
+
+        existing_id = email_to_id.get(values['email'])
+        if existing_id is not None:
+            values['id'] = existing_id
+            updates.append(values)
+        else:
+            inserts.append(values)
+        pending_emails.add(values['email'])
+
+        if len(inserts) + len(updates) >= chunk_size:
+            yield flush()
+
+    if inserts or updates:
+        yield flush()
+    elif not summary['chunks']:
+        yield dict(summary)
+
+
+def upsert_alumni_by_email(documents, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Run iter_upsert_alumni_by_email to completion and return the final summary"""
+    summary = None
+    for summary in iter_upsert_alumni_by_email(documents, chunk_size=chunk_size):
+        if progress:
+            progress(summary)
+    return summary
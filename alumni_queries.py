@@ -0,0 +1,165 @@
+import base64
+import json
+from sqlalchemy import or_, and_
+from models import Alumni
+
+# Columns the list view may be sorted by. Each one is NOT NULL, so the
+# (column, id) pair is a total order and can be used as a keyset cursor.
+SORTABLE_COLUMNS = {
+    'last_name': Alumni.last_name,
+    'first_name': Alumni.first_name,
+    'department': Alumni.department,
+    'graduation_year': Alumni.graduation_year,
+}
+
+DEFAULT_SORT = 'last_name'
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Columns matched by the free-text `q` filter
+SEARCH_COLUMNS = [
+    Alumni.first_name,
+    Alumni.last_name,
+    Alumni.email,
+    Alumni.department,
+    Alumni.current_employer,
+    Alumni.job_title,
+]
+
+
+def encode_cursor(value, row_id):
+    """Encode a (sort value, id) pair as an opaque URL-safe cursor"""
+    raw = json.dumps([value, row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, or return None if invalid"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return value, int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_list_args(args):
+    """Normalize the filter/sort/page query-string arguments of the list view"""
+    sort = args.get('sort', DEFAULT_SORT)
+    if sort not in SORTABLE_COLUMNS:
+        sort = DEFAULT_SORT
+
+    direction = args.get('dir', 'asc').lower()
+    if direction not in ('asc', 'desc'):
+        direction = 'asc'
+
+    try:
+        page_size = int(args.get('per_page', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        page_size = DEFAULT_PAGE_SIZE
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+    graduation_year = None
+    if args.get('graduation_year'):
+        try:
+            graduation_year = int(args['graduation_year'])
+        except ValueError:
+            graduation_year = None
+
+    return {
+        'q': (args.get('q') or '').strip(),
+        'department': (args.get('department') or '').strip(),
+        'degree': (args.get('degree') or '').strip(),
+        'graduation_year': graduation_year,
+        'sort': sort,
+        'dir': direction,
+        'per_page': page_size,
+    }
+
+
+def escape_like(value, escape='\\'):
+    """Escape LIKE wildcards so user input matches literally"""
+    return value.replace(escape, escape * 2).replace('%', escape + '%').replace('_', escape + '_')
+
+
+def apply_alumni_filters(query, filters):
+    """Apply the list-view filters to an Alumni query"""
+    if filters.get('q'):
+        pattern = f"%{escape_like(filters['q'])}%"
+        query = query.filter(or_(*[column.ilike(pattern, escape='\\') for column in SEARCH_COLUMNS]))
+    if filters.get('department'):
+        query = query.filter(Alumni.department == filters['department'])
+    if filters.get('degree'):
+        query = query.filter(Alumni.degree == filters['degree'])
+    if filters.get('graduation_year') is not None:
+        query = query.filter(Alumni.graduation_year == filters['graduation_year'])
+    return query
+
+
+def apply_alumni_sort(query, filters, reverse=False):
+    """Order an Alumni query by the selected sort column with id as tie-breaker"""
+    column = SORTABLE_COLUMNS[filters['sort']]
+    descending = (filters['dir'] == 'desc') != reverse
+    if descending:
+        return query.order_by(column.desc(), Alumni.id.desc())
+    return query.order_by(column.asc(), Alumni.id.asc())
+
+
+def _seek(query, filters, cursor, forward):
+    """Restrict a query to rows strictly after (or before) the cursor position"""
+    column = SORTABLE_COLUMNS[filters['sort']]
+    value, row_id = cursor
+    descending = filters['dir'] == 'desc'
+    # Moving forward through a descending list is the same as moving
+    # backward through an ascending one, and vice versa.
+    if descending == forward:
+        return query.filter(or_(column < value, and_(column == value, Alumni.id < row_id)))
+    return query.filter(or_(column > value, and_(column == value, Alumni.id > row_id)))
+
+
+def keyset_page(query, filters, after=None, before=None):
+    """Fetch one page of alumni using keyset pagination.
+
+    `after` and `before` are cursors returned by a previous call. Only one
+    of them is honoured; `after` wins if both are supplied. Returns a dict
+    with the rows and the cursors for the neighbouring pages.
+    """
+    page_size = filters['per_page']
+    sort_attr = filters['sort']
+    after_key = decode_cursor(after)
+    before_key = decode_cursor(before) if after_key is None else None
+
+    query = apply_alumni_filters(query, filters)
+
+    if before_key is not None:
+        # Walk backwards from the cursor, then flip the rows back into display order
+        rows = apply_alumni_sort(_seek(query, filters, before_key, forward=False),
+                                 filters, reverse=True).limit(page_size + 1).all()
+        has_prev = len(rows) > page_size
+        rows = list(reversed(rows[:page_size]))
+        has_next = True
+    else:
+        if after_key is not None:
+            query = _seek(query, filters, after_key, forward=True)
+        rows = apply_alumni_sort(query, filters).limit(page_size + 1).all()
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        has_prev = after_key is not None
+
+    next_cursor = None
+    prev_cursor = None
+    if rows:
+        if has_next:
+            last = rows[-1]
+            next_cursor = encode_cursor(getattr(last, sort_attr), last.id)
+        if has_prev:
+            first = rows[0]
+            prev_cursor = encode_cursor(getattr(first, sort_attr), first.id)
+
+    return {
+        'items': rows,
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor,
+    }
@@ -0,0 +1,201 @@
+import re
+from collections import namedtuple
+from sqlalchemy import event, select, delete, insert, func, inspect
+from sqlalchemy.orm import Session
+from sql_helpers import insert_ignoring_conflicts
+from models import db, Alumni, Skill, Language, Interest, alumni_skill, alumni_language, alumni_interest
+
+TagKind = namedtuple('TagKind', ['model', 'link_table', 'link_column', 'source_column'])
+
+# Each normalized table and the free-text Alumni column it is parsed from
+TAG_KINDS = {
+    'skill': TagKind(Skill, alumni_skill, 'skill_id', 'technical_skills'),
+    'language': TagKind(Language, alumni_language, 'language_id', 'languages_known'),
+    'interest': TagKind(Interest, alumni_interest, 'interest_id', 'areas_of_interest'),
+}
+
+SOURCE_COLUMNS = [kind.source_column for kind in TAG_KINDS.values()]
+
+# Keeps IN lists well below SQLite's bound-parameter limit
+ID_CHUNK_SIZE = 500
+
+TAG_MAX_LENGTH = Skill.__table__.c.name.type.length
+
+_SPLIT_RE = re.compile(r'[,;\n]+')
+
+_tables_ready = False
+
+
+def parse_tags(text):
+    """Split a free-text list into {normalized name: label}, keeping first-seen order"""
+    tags = {}
+    for part in _SPLIT_RE.split(text or ''):
+        label = ' '.join(part.split())[:TAG_MAX_LENGTH]
+        if label and label.lower() not in tags:
+            tags[label.lower()] = label
+    return tags
+
+
+def _chunks(items, size=ID_CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def ensure_tag_tables(connection):
+    """Create the tag tables on databases that predate them"""
+    global _tables_ready
+    if not _tables_ready:
+        for kind in TAG_KINDS.values():
+            kind.model.__table__.create(connection, checkfirst=True)
+            kind.link_table.create(connection, checkfirst=True)
+        _tables_ready = True
+
+
+def _tag_ids(connection, model, labels_by_name):
+    """Return {name: id} for the given tags, creating the ones that do not exist yet"""
+    ids = {}
+    for names in _chunks(labels_by_name):
+        ids.update(connection.execute(select(model.name, model.id).where(model.name.in_(names))).all())
+    missing = [name for name in labels_by_name if name not in ids]
+    if missing:
+        connection.execute(
+            insert_ignoring_conflicts(connection.dialect.name, model.__table__, index_elements=['name']),
+            [{'name': name, 'label': labels_by_name[name]} for name in missing]
+        )
+        for names in _chunks(missing):
+            ids.update(connection.execute(select(model.name, model.id).where(model.name.in_(names))).all())
+    return ids
+
+
+def clear_alumni_tags(connection, alumni_ids):
+    """Remove every tag link of the given alumni"""
+    ensure_tag_tables(connection)
+    for chunk in _chunks(alumni_ids):
+        for kind in TAG_KINDS.values():
+            connection.execute(delete(kind.link_table).where(kind.link_table.c.alumni_id.in_(chunk)))
+
+
+def sync_alumni_tags(connection, alumni_ids):
+    """Rebuild the tag links of the given alumni from their text columns"""
+    ensure_tag_tables(connection)
+    for chunk in _chunks(alumni_ids):
+        rows = connection.execute(
+            select(Alumni.id, *[getattr(Alumni, column) for column in SOURCE_COLUMNS])
+            .where(Alumni.id.in_(chunk))
+        ).all()
+        for kind in TAG_KINDS.values():
+            parsed = {row.id: parse_tags(getattr(row, kind.source_column)) for row in rows}
+            labels_by_name = {}
+            for tags in parsed.values():
+                for name, label in tags.items():
+                    labels_by_name.setdefault(name, label)
+            ids = _tag_ids(connection, kind.model, labels_by_name) if labels_by_name else {}
+
+            connection.execute(delete(kind.link_table).where(kind.link_table.c.alumni_id.in_(chunk)))
+            links = [
+                {'alumni_id': alumni_id, kind.link_column: ids[name]}
+                for alumni_id, tags in parsed.items()
+                for name in tags
+            ]
+            if links:
+                connection.execute(insert(kind.link_table), links)
+
+
+def sync_alumni_tags_by_email(connection, emails):
+    """Rebuild tag links for rows written by Core or bulk statements, which only know emails"""
+    alumni_ids = []
+    for chunk in _chunks(emails):
+        alumni_ids.extend(connection.execute(select(Alumni.id).where(Alumni.email.in_(chunk))).scalars())
+    sync_alumni_tags(connection, alumni_ids)
+
+
+@event.listens_for(Session, 'after_flush')
+def _sync_changed_alumni_tags(session, flush_context):
+    # ORM writes (admin forms, submit APIs, profile edits) are picked up here;
+    # Core and bulk writers call sync_alumni_tags themselves.
+    changed = []
+    deleted = []
+    for obj in session.new:
+        if isinstance(obj, Alumni):
+            changed.append(obj.id)
+    for obj in session.dirty:
+        if isinstance(obj, Alumni):
+            state = inspect(obj)
+            if any(state.attrs[column].history.has_changes() for column in SOURCE_COLUMNS):
+                changed.append(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Alumni):
+            deleted.append(obj.id)
+    if deleted:
+        clear_alumni_tags(session.connection(), deleted)
+    if changed:
+        sync_alumni_tags(session.connection(), changed)
+
+
+def backfill_alumni_tags(batch_size=1000):
+    """Rebuild the tag links of every alumni in id order, committing per batch"""
+    ensure_tag_tables(db.session.connection())
+    total = 0
+    last_id = 0
+    while True:
+        alumni_ids = db.session.execute(
+            select(Alumni.id).where(Alumni.id > last_id).order_by(Alumni.id).limit(batch_size)
+        ).scalars().all()
+        if not alumni_ids:
+            break
+        sync_alumni_tags(db.session.connection(), alumni_ids)
+        db.session.commit()
+        total += len(alumni_ids)
+        last_id = alumni_ids[-1]
+    return total
+
+
+def find_alumni_by_tags(kind_name, names, match='any', limit=50, after_id=None):
+    """Alumni linked to any (or all) of the given tags, in id order.
+
+    Returns (alumni, next_after_id) where next_after_id is None on the last page.
+    """
+    kind = TAG_KINDS[kind_name]
+    tags = {}
+    for name in names:
+        tags.update(parse_tags(name))
+    if not tags:
+        return [], None
+    ensure_tag_tables(db.session.connection())
+
+    link_alumni_id = kind.link_table.c.alumni_id
+    matched = (
+        select(link_alumni_id)
+        .join(kind.model, kind.model.id == kind.link_table.c[kind.link_column])
+        .where(kind.model.name.in_(list(tags)))
+        .group_by(link_alumni_id)
+    )
+    if match == 'all':
+        matched = matched.having(func.count() == len(tags))
+    if after_id:
+        matched = matched.where(link_alumni_id > after_id)
+    alumni_ids = db.session.execute(matched.order_by(link_alumni_id).limit(limit + 1)).scalars().all()
+
+    next_after_id = alumni_ids[limit - 1] if len(alumni_ids) > limit else None
+    alumni_ids = alumni_ids[:limit]
+    alumni = Alumni.query.filter(Alumni.id.in_(alumni_ids)).order_by(Alumni.id).all() if alumni_ids else []
+    return alumni, next_after_id
+
+
+def tag_frequencies(kind_name, limit=50, department=None):
+    """Most common tags of one kind as (name, label, count), optionally within a department"""
+    kind = TAG_KINDS[kind_name]
+    ensure_tag_tables(db.session.connection())
+    link_column = kind.link_table.c[kind.link_column]
+    count = func.count(link_column).label('count')
+    statement = select(kind.model.name, kind.model.label, count).join(kind.link_table, link_column == kind.model.id)
+    if department:
+        statement = (statement
+                     .join(Alumni, Alumni.id == kind.link_table.c.alumni_id)
+                     .where(Alumni.department == department))
+    statement = (statement
+                 .group_by(kind.model.id, kind.model.name, kind.model.label)
+                 .order_by(count.desc(), kind.model.name)
+                 .limit(limit))
+    return db.session.execute(statement).all()
@@ -1,9 +1,31 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, Response, stream_with_context
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from models import db, Alumni, User
 from config import Config
+from alumni_queries import parse_list_args, keyset_page
+from search_index import search_alumni, ensure_search_index
+from change_tracking import get_dashboard_stats
+from alumni_ingest import bulk_insert_alumni, iter_bulk_records, portal_to_record, validate_record, PORTAL_REQUIRED_FIELDS
+from registration_queue import get_registration_queue
+from alumni_export import EXPORTERS, EXPORT_FORMATS, parquet_available
+from alumni_tags import TAG_KINDS, find_alumni_by_tags, tag_frequencies, backfill_alumni_tags
+from duplicate_filter import insert_alumni, init_app as init_duplicate_filter
+from login_security import init_login_guard, LoginThrottled, HashingBusy
+from idempotency import idempotent
+import schema_upgrades
+from http_caching import conditional_get, table_validators, make_etag
+import metrics
+import assets
+import engine_profiles
+import compression
+from query_budget import query_budget, init_app as init_query_budget
+import hmac
 from sqlalchemy import func
+from sqlalchemy.orm import load_only
 from datetime import datetime
+from itertools import groupby
+from operator import attrgetter
 import sys
 import json
 import os
@@ -14,6 +36,11 @@ from functools import wraps
 
 app = Flask(__name__)
 app.config.from_object(Config)
+
+# Behind Render's proxy every request arrives from the proxy's address; take the
+# client address from X-Forwarded-For, trusting only the configured number of hops
+if app.config['PROXY_FIX_X_FOR']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
 # Enable CORS for API routes so GitHub Pages (different origin) can call backend
@@ -28,13 +55,58 @@ else:
 
 try:
     db.init_app(app)
+    # WAL and pragmas for SQLite, pool sizing and timeouts for Postgres (DATABASE_ENGINE_PROFILE)
+    engine_profiles.init_app(app, db)
 except Exception as e:
     print(f"Database initialization error: {str(e)}", file=sys.stderr)
     sys.exit(1)
 
+# Compress large HTML/JSON responses; registered first so its after_request hook runs last
+compression.init_app(app)
+
+# Per-endpoint latency, status and SQL metrics, served on /metrics
+metrics.init_app(app)
+
+# Fingerprinted, precompressed static files (built by `flask build-assets`)
+assets.init_app(app)
+
+# SQL statement budgets and N+1 detection (QUERY_BUDGET_MODE=log|raise)
+init_query_budget(app)
+
+# Create tables and triggers added since the database was first created, before any request runs
+schema_upgrades.init_app(app)
+
+# Bloom filters over emails and student ids, warmed in the background
+init_duplicate_filter(app)
+
+# Start draining any submissions left queued by a previous run
+if app.config['REGISTRATION_QUEUE_ENABLED']:
+    get_registration_queue(app)
+
+# Throttled, pool-backed password hashing for login and change-password
+login_guard = init_login_guard(app)
+
 # Set secret key for sessions
 app.secret_key = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
 
+# Statement budget for the alumni write routes. Steady state is 15-20 (the tag sync
+# runs up to 5 per tag kind) and the first write on a fresh database adds the table
+# checks; raise mode fires after the commit, so leave headroom rather than fail a saved write
+WRITE_QUERY_BUDGET = 40
+
+# Columns shown in the by-department tables
+DEPARTMENT_MEMBER_COLUMNS = (
+    Alumni.id, Alumni.first_name, Alumni.last_name, Alumni.degree, Alumni.department,
+    Alumni.graduation_year, Alumni.current_employer, Alumni.job_title
+)
+
+# Conditional GET validators for single profiles
+def alumni_profile_validators(id):
+    updated_at = db.session.query(Alumni.updated_at).filter(Alumni.id == id).scalar()
+    if updated_at is None:
+        return None
+    return make_etag('profile', id, updated_at.isoformat()), updated_at
+
 # Login required decorator
 def login_required(f):
     @wraps(f)
@@ -45,6 +117,19 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# Admin session or bulk ingest token required decorator
+def ingest_auth_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' in session:
+            return f(*args, **kwargs)
+        token = app.config.get('BULK_INGEST_TOKEN')
+        auth_header = request.headers.get('Authorization', '')
+        if token and auth_header.startswith('Bearer ') and hmac.compare_digest(auth_header[7:], token):
+            return f(*args, **kwargs)
+        return jsonify({'status': 'error', 'message': 'Authentication required'}), 401
+    return decorated_function
+
 # Authentication routes
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -52,9 +137,20 @@ def login():
         username = request.form.get('username')
         password = request.form.get('password')
         
-        user = User.query.filter_by(username=username).first()
+        try:
+            user = login_guard.authenticate(username, password, request.remote_addr)
+        except LoginThrottled as e:
+            flash(f'Too many login attempts. Please try again in {e.retry_after} seconds.', 'error')
+            response = app.make_response((render_template('login.html'), 429))
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response
+        except HashingBusy as e:
+            flash('The server is busy. Please try again in a moment.', 'error')
+            response = app.make_response((render_template('login.html'), 429))
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response
         
-        if user and user.check_password(password):
+        if user:
             session['user_id'] = user.id
             session['username'] = user.username
             session['role'] = user.role
@@ -82,24 +178,38 @@ def change_password():
         # Get current user
         user = User.query.get(session['user_id'])
         
-        if not user.check_password(current_password):
-            flash('Current password is incorrect.', 'error')
-        elif new_password != confirm_password:
-            flash('New passwords do not match.', 'error')
-        elif len(new_password) < 6:
-            flash('New password must be at least 6 characters long.', 'error')
-        else:
-            # Update password
-            user.set_password(new_password)
-            db.session.commit()
-            flash('Password changed successfully!', 'success')
-            return redirect(url_for('dashboard'))
+        try:
+            if not login_guard.check_current_password(user, current_password, request.remote_addr):
+                flash('Current password is incorrect.', 'error')
+            elif new_password != confirm_password:
+                flash('New passwords do not match.', 'error')
+            elif len(new_password) < 6:
+                flash('New password must be at least 6 characters long.', 'error')
+            else:
+                # Update password
+                login_guard.set_password(user, new_password)
+                db.session.commit()
+                flash('Password changed successfully!', 'success')
+                return redirect(url_for('dashboard'))
+        except (LoginThrottled, HashingBusy) as e:
+            if isinstance(e, LoginThrottled):
+                flash(f'Too many attempts. Please try again in {e.retry_after} seconds.', 'error')
+            else:
+                flash('The server is busy. Please try again in a moment.', 'error')
+            response = app.make_response((render_template('change_password.html'), 429))
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response
     
     return render_template('change_password.html')
 
+def duplicate_message(field):
+    label = 'email address' if field == 'email' else 'student ID'
+    return f'An alumni with this {label} is already registered.'
+
 # Route to display the Google Form
 @app.route('/alumni/register', methods=['GET', 'POST'])
 @login_required
+@query_budget(WRITE_QUERY_BUDGET)
 def alumni_register():
     if request.method == 'POST':
         try:
@@ -149,10 +259,11 @@ def alumni_register():
                 areas_of_interest=request.form.get('areas_of_interest', '')
             )
             
-            db.session.add(alumni)
-            db.session.commit()
-            flash('Registration successful! Welcome to the alumni network.', 'success')
-            return redirect(url_for('dashboard'))
+            _, duplicate = insert_alumni(alumni)
+            if duplicate is None:
+                flash('Registration successful! Welcome to the alumni network.', 'success')
+                return redirect(url_for('dashboard'))
+            flash(duplicate_message(duplicate), 'error')
         except Exception as e:
             flash(f'Error during registration: {str(e)}', 'error')
     
@@ -160,6 +271,8 @@ def alumni_register():
 
 # API endpoint to receive Google Form submissions
 @app.route('/api/alumni/submit', methods=['POST'])
+@idempotent
+@query_budget(WRITE_QUERY_BUDGET)
 def receive_alumni_submission():
     try:
         data = request.get_json()
@@ -221,62 +334,237 @@ def receive_alumni_submission():
             areas_of_interest=data.get('areas_of_interest', '')
         )
         
-        db.session.add(alumni)
-        db.session.commit()
+        _, duplicate = insert_alumni(alumni)
+        if duplicate:
+            return jsonify({'status': 'error', 'message': duplicate_message(duplicate), 'field': duplicate}), 409
         
         return jsonify({'status': 'success', 'message': 'Alumni data received successfully'}), 200
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
+# Bulk ingest: NDJSON or a JSON array of /api/alumni/submit records
+@app.route('/api/alumni/bulk', methods=['POST'])
+@ingest_auth_required
+@query_budget(allow_repeats=True)
+def bulk_alumni_submission():
+    record_format = request.args.get('format', 'submit')
+    if record_format not in ('submit', 'portal'):
+        return jsonify({'status': 'error', 'message': 'format must be submit or portal'}), 400
+
+    try:
+        records = iter_bulk_records(request.stream, request.content_type or '')
+        summary, results = bulk_insert_alumni(records, record_format=record_format)
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+    return jsonify({'status': 'success', 'summary': summary, 'results': results}), 200
+
 @app.route('/')
 @login_required
+@conditional_get(lambda: table_validators('dashboard'))
+@query_budget(5)
 def dashboard():
-    total_alumni = Alumni.query.count()
-    recent_alumni = Alumni.query.order_by(Alumni.created_at.desc()).limit(5).all()
-    graduation_years = db.session.query(
-        Alumni.graduation_year, 
-        func.count(Alumni.id)
-    ).group_by(Alumni.graduation_year).all()
+    # Aggregates are recomputed only after the alumni table changes
+    stats = get_dashboard_stats()
     
     return render_template('dashboard.html',
-                         total_alumni=total_alumni,
-                         recent_alumni=recent_alumni,
-                         graduation_years=graduation_years)
+                         total_alumni=stats['total_alumni'],
+                         recent_alumni=stats['recent_alumni'],
+                         graduation_years=stats['graduation_years'])
 
 @app.route('/alumni')
 @login_required
+@conditional_get(lambda: table_validators('alumni_list'))
+@query_budget(3)
 def alumni_list():
-    alumni = Alumni.query.order_by(Alumni.last_name).all()
-    return render_template('alumni_list.html', alumni=alumni)
+    filters = parse_list_args(request.args)
+    page = keyset_page(Alumni.query, filters,
+                       after=request.args.get('after'),
+                       before=request.args.get('before'))
+    departments = [d for (d,) in db.session.query(Alumni.department).distinct().order_by(Alumni.department)]
+    # Filters carried over into the pager links
+    page_args = {key: value for key, value in filters.items() if value not in ('', None)}
+    return render_template('alumni_list.html',
+                         alumni=page['items'],
+                         next_cursor=page['next_cursor'],
+                         prev_cursor=page['prev_cursor'],
+                         filters=filters,
+                         page_args=page_args,
+                         departments=departments)
+
+@app.route('/alumni/export.<fmt>')
+@login_required
+def export_alumni(fmt):
+    if fmt not in EXPORTERS:
+        return jsonify({'success': False, 'error': f'Unsupported export format: {fmt}'}), 404
+    if fmt == 'parquet' and not parquet_available():
+        return jsonify({'success': False, 'error': 'Parquet export requires pyarrow to be installed'}), 501
+
+    # Same filters and ordering as the list view, without the page size
+    filters = parse_list_args(request.args)
+    filename = f"alumni-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{fmt}"
+    return Response(
+        stream_with_context(EXPORTERS[fmt](filters)),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
 
 @app.route('/alumni/by-department')
 @login_required
+@conditional_get(lambda: table_validators('alumni_by_department'))
+@query_budget(3)
 def alumni_by_department():
-    # Get all departments and count of alumni in each
+    # Department counts only; members are fetched per department on expand
     department_stats = db.session.query(
         Alumni.department,
         func.count(Alumni.id).label('count')
     ).group_by(Alumni.department).order_by(Alumni.department).all()
-    
-    # Get alumni grouped by department
-    departments = {}
-    for dept, count in department_stats:
-        alumni_in_dept = Alumni.query.filter_by(department=dept).order_by(Alumni.last_name).all()
-        departments[dept] = {
-            'count': count,
-            'alumni': alumni_in_dept
-        }
-    
-    return render_template('alumni_by_department.html', departments=departments)
+
+    groups = None
+    if request.args.get('expand') == 'all':
+        # One ordered query for every member, grouped by department while streaming
+        members = Alumni.query.options(load_only(*DEPARTMENT_MEMBER_COLUMNS)).order_by(
+            Alumni.department, Alumni.last_name, Alumni.id
+        ).yield_per(500)
+        groups = ((dept, list(rows)) for dept, rows in groupby(members, key=attrgetter('department')))
+
+    return render_template('alumni_by_department.html',
+                         department_stats=department_stats,
+                         groups=groups)
+
+@app.route('/alumni/by-department/members')
+@login_required
+@conditional_get(lambda: table_validators('alumni_department_members'))
+@query_budget(2)
+def alumni_department_members():
+    department = request.args.get('department', '')
+    filters = parse_list_args({'department': department, 'per_page': request.args.get('per_page', 100)})
+    if not filters['department']:
+        return jsonify({'success': False, 'error': 'department is required'}), 400
+
+    page = keyset_page(Alumni.query.options(load_only(*DEPARTMENT_MEMBER_COLUMNS)), filters,
+                       after=request.args.get('after'))
+    return jsonify({
+        'success': True,
+        'department': department,
+        'alumni': [{
+            'id': alumni.id,
+            'first_name': alumni.first_name,
+            'last_name': alumni.last_name,
+            'degree': alumni.degree,
+            'graduation_year': alumni.graduation_year,
+            'current_employer': alumni.current_employer,
+            'job_title': alumni.job_title,
+            'profile_url': url_for('alumni_profile', id=alumni.id),
+            'edit_url': url_for('edit_alumni', id=alumni.id)
+        } for alumni in page['items']],
+        'next_cursor': page['next_cursor']
+    })
+
+@app.route('/api/alumni/search')
+@login_required
+@query_budget(3)
+def api_search_alumni():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'success': False, 'error': 'Search query is required'}), 400
+
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        limit = 20
+
+    try:
+        results = search_alumni(query, limit=limit)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    data = []
+    for alumni, score in results:
+        item = alumni.to_dict()
+        item['score'] = score
+        data.append(item)
+
+    return jsonify({
+        'success': True,
+        'query': query,
+        'data': data,
+        'count': len(data)
+    })
+
+@app.route('/api/alumni/skills')
+@login_required
+@query_budget(3)
+def api_alumni_by_skill():
+    """Alumni with the given skills, languages or interests (?kind=skill|language|interest)"""
+    kind = request.args.get('kind', 'skill')
+    if kind not in TAG_KINDS:
+        return jsonify({'success': False, 'error': f"kind must be one of {', '.join(TAG_KINDS)}"}), 400
+    names = request.args.getlist('name')
+    if not any(name.strip() for name in names):
+        return jsonify({'success': False, 'error': 'At least one name is required'}), 400
+    match = request.args.get('match', 'any')
+    if match not in ('any', 'all'):
+        return jsonify({'success': False, 'error': 'match must be any or all'}), 400
+
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+        after = int(request.args['after']) if request.args.get('after') else None
+    except ValueError:
+        return jsonify({'success': False, 'error': 'limit and after must be integers'}), 400
+
+    try:
+        alumni, next_after = find_alumni_by_tags(kind, names, match=match, limit=limit, after_id=after)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    return jsonify({
+        'success': True,
+        'kind': kind,
+        'data': [item.to_dict() for item in alumni],
+        'count': len(alumni),
+        'next_after': next_after
+    })
+
+@app.route('/api/skills/frequency')
+@login_required
+@query_budget(2)
+def api_skill_frequency():
+    """Most common skills, languages or interests, optionally within one department"""
+    kind = request.args.get('kind', 'skill')
+    if kind not in TAG_KINDS:
+        return jsonify({'success': False, 'error': f"kind must be one of {', '.join(TAG_KINDS)}"}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+    except ValueError:
+        limit = 50
+
+    try:
+        rows = tag_frequencies(kind, limit=limit, department=request.args.get('department') or None)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    return jsonify({
+        'success': True,
+        'kind': kind,
+        'data': [{'name': name, 'label': label, 'count': count} for name, label, count in rows]
+    })
 
 @app.route('/alumni/<int:id>')
 @login_required
+@conditional_get(alumni_profile_validators)
+@query_budget(2)
 def alumni_profile(id):
     alumni = Alumni.query.get_or_404(id)
     return render_template('alumni_profile.html', alumni=alumni)
 
 @app.route('/alumni/add', methods=['GET', 'POST'])
 @login_required
+@query_budget(WRITE_QUERY_BUDGET)
 def add_alumni():
     if request.method == 'POST':
         try:
@@ -325,10 +613,11 @@ def add_alumni():
                 languages_known=request.form.get('languages_known', ''),
                 areas_of_interest=request.form.get('areas_of_interest', '')
             )
-            db.session.add(alumni)
-            db.session.commit()
-            flash('Alumni added successfully!', 'success')
-            return redirect(url_for('dashboard'))
+            _, duplicate = insert_alumni(alumni)
+            if duplicate is None:
+                flash('Alumni added successfully!', 'success')
+                return redirect(url_for('dashboard'))
+            flash(duplicate_message(duplicate), 'error')
         except Exception as e:
             flash(f'Error adding alumni: {str(e)}', 'error')
     
@@ -336,6 +625,7 @@ def add_alumni():
 
 @app.route('/alumni/<int:id>/edit', methods=['GET', 'POST'])
 @login_required
+@query_budget(WRITE_QUERY_BUDGET)
 def edit_alumni(id):
     alumni = Alumni.query.get_or_404(id)
     if request.method == 'POST':
@@ -408,6 +698,7 @@ def sync_sheets():
 
 @app.route('/alumni/<int:id>/delete', methods=['POST'])
 @login_required
+@query_budget(10)
 def delete_alumni(id):
     try:
         alumni = Alumni.query.get_or_404(id)
@@ -428,7 +719,12 @@ def registration_portal():
     return render_template('registration_portal.html')
 
 @app.route('/api/registration-portal/submit', methods=['POST'])
+@idempotent
+@query_budget(WRITE_QUERY_BUDGET)
 def registration_portal_submit():
+    if app.config['REGISTRATION_QUEUE_ENABLED']:
+        return enqueue_registration_submission()
+
     try:
         data = request.get_json()
         
@@ -491,13 +787,18 @@ def registration_portal_submit():
             areas_of_interest=data.get('interests', '')
         )
         
-        db.session.add(alumni)
-        db.session.commit()
+        alumni_id, duplicate = insert_alumni(alumni)
+        if duplicate:
+            return jsonify({
+                'success': False,
+                'message': duplicate_message(duplicate),
+                'field': duplicate
+            }), 409
         
         return jsonify({
             'success': True,
             'message': 'Registration successful! Welcome to the alumni network.',
-            'alumni_id': alumni.id
+            'alumni_id': alumni_id
         }), 200
         
     except Exception as e:
@@ -507,10 +808,86 @@ def registration_portal_submit():
             'message': f'Error during registration: {str(e)}'
         }), 500
 
+def enqueue_registration_submission():
+    # Write-behind mode: validate, persist to the local queue and acknowledge
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'message': 'Request body must be a JSON object'}), 400
+
+    _, errors = validate_record(portal_to_record(data), required=PORTAL_REQUIRED_FIELDS)
+    if errors:
+        return jsonify({'success': False, 'message': 'Invalid registration: ' + '; '.join(errors)}), 400
+
+    try:
+        submission_id = get_registration_queue(app).enqueue(data)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error during registration: {str(e)}'
+        }), 500
+
+    return jsonify({
+        'success': True,
+        'message': 'Registration received! Welcome to the alumni network.',
+        'submission_id': submission_id,
+        'status_url': url_for('registration_portal_status', submission_id=submission_id)
+    }), 202
+
+@app.route('/api/registration-portal/status/<submission_id>', methods=['GET'])
+def registration_portal_status(submission_id):
+    if not app.config['REGISTRATION_QUEUE_ENABLED']:
+        return jsonify({'success': False, 'message': 'Registration queue is not enabled'}), 404
+
+    status = get_registration_queue(app).get_status(submission_id)
+    if status is None:
+        return jsonify({'success': False, 'message': 'Submission not found'}), 404
+    return jsonify({'success': True, **status}), 200
+
 @app.route('/registration-success')
 def registration_success():
     return render_template('registration_success.html')
 
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape endpoint, aggregated across the workers on this host"""
+    token = app.config.get('METRICS_TOKEN')
+    if token:
+        auth_header = request.headers.get('Authorization', '')
+        if not (auth_header.startswith('Bearer ') and hmac.compare_digest(auth_header[7:], token)):
+            return Response('Authentication required\n', status=401, mimetype='text/plain')
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.cli.command('upgrade-schema')
+def upgrade_schema_command():
+    """Add the indexes, tables and triggers introduced since the database was created"""
+    with db.engine.begin() as connection:
+        if schema_upgrades.upgrade_schema(connection):
+            print('Database schema is up to date')
+        else:
+            print('No alumni table yet; run the app once to create the database')
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index():
+    """Create the full-text index if needed and repopulate it from the alumni table"""
+    with db.engine.begin() as connection:
+        if ensure_search_index(connection, rebuild=True):
+            print('Search index rebuilt')
+        else:
+            print(f'Full-text search is not supported on {connection.dialect.name}')
+
+@app.cli.command('backfill-alumni-tags')
+def backfill_alumni_tags_command():
+    """Create the skill/language/interest tables and link every existing alumni"""
+    total = backfill_alumni_tags()
+    print(f'Linked skills, languages and interests for {total} alumni')
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """Write content-hashed, precompressed copies of static/ and the asset manifest"""
+    manifest = assets.build_assets(app.static_folder)
+    encodings = 'gzip and brotli' if assets.brotli is not None else 'gzip (install brotli for .br files)'
+    print(f'Built {len(manifest)} assets with {encodings}')
+
 if __name__ == '__main__':
     try:
         with app.app_context():
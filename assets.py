@@ -0,0 +1,120 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+from flask import current_app, request, send_from_directory, url_for, abort
+
+# Build output lives under static/dist and is served from /assets
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+ASSET_URL_PREFIX = '/assets'
+
+# Extensions worth precompressing; images are already compressed
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.txt', '.html', '.map'}
+
+# Hashed filenames never change content, so caches may keep them for a year
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Encodings tried in order of preference: (Accept-Encoding token, file suffix)
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _hashed_name(relative_path, content):
+    stem, extension = os.path.splitext(relative_path)
+    return f'{stem}.{hashlib.sha256(content).hexdigest()[:10]}{extension}'
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def build_assets(static_folder):
+    """Copy static files to content-hashed names with .gz/.br variants and write the manifest.
+
+    Returns the manifest ({original path: hashed path}, relative to static/).
+    """
+    dist_folder = os.path.join(static_folder, DIST_DIR)
+    if os.path.isdir(dist_folder):
+        shutil.rmtree(dist_folder)
+
+    manifest = {}
+    for root, dirs, files in os.walk(static_folder):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != dist_folder)
+        for name in sorted(files):
+            source = os.path.join(root, name)
+            relative_path = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            if name.startswith('.') or name.endswith('.md'):
+                continue
+            with open(source, 'rb') as f:
+                content = f.read()
+            hashed = _hashed_name(relative_path, content)
+            target = os.path.join(dist_folder, hashed)
+            _write(target, content)
+
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                # mtime=0 keeps the gzip output byte-for-byte reproducible
+                _write(target + '.gz', gzip.compress(content, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    _write(target + '.br', brotli.compress(content, quality=11))
+            manifest[relative_path] = hashed
+
+    _write(os.path.join(dist_folder, MANIFEST_NAME),
+           json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return manifest
+
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def asset_url_for(endpoint, **values):
+    """url_for for templates: static files resolve to their fingerprinted build when one exists"""
+    if endpoint == 'static':
+        hashed = current_app.extensions.get('asset_manifest', {}).get(values.get('filename'))
+        if hashed:
+            values['filename'] = hashed
+            return url_for('hashed_asset', **values)
+    return url_for(endpoint, **values)
+
+
+def _preferred_encoding(path):
+    for token, suffix in ENCODINGS:
+        if request.accept_encodings[token] and os.path.exists(path + suffix):
+            return token, suffix
+    return None, ''
+
+
+def serve_hashed_asset(filename):
+    """Serve a fingerprinted file, picking a precompressed variant from Accept-Encoding"""
+    dist_folder = os.path.join(current_app.static_folder, DIST_DIR)
+    if filename == MANIFEST_NAME or filename.endswith(tuple(suffix for _, suffix in ENCODINGS)):
+        abort(404)
+    path = os.path.join(dist_folder, filename)
+    encoding, suffix = _preferred_encoding(path)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response = send_from_directory(dist_folder, filename + suffix, mimetype=mimetype, max_age=31536000)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_app(app):
+    """Load the asset manifest and route template url_for calls through it"""
+    app.extensions['asset_manifest'] = load_manifest(app.static_folder)
+    app.add_url_rule(ASSET_URL_PREFIX + '/<path:filename>', 'hashed_asset', serve_hashed_asset)
+    app.jinja_env.globals['url_for'] = asset_url_for
@@ -0,0 +1,39 @@
+"""Compare two run_benchmarks.py result files scenario by scenario.
+
+    python benchmarks/compare.py baseline.json candidate.json --metric p95_ms
+"""
+import argparse
+import json
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--metric', default='p50_ms', help='Result field to compare (default: p50_ms)')
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)
+    candidate = load(args.candidate)
+    print(f"baseline  {(baseline['meta'].get('commit') or '?')[:10]}  rows={baseline['meta']['rows']}")
+    print(f"candidate {(candidate['meta'].get('commit') or '?')[:10]}  rows={candidate['meta']['rows']}")
+    print(f"{'scenario':<34}{'baseline':>12}{'candidate':>12}{'change':>10}")
+    for name in sorted(set(baseline['results']) | set(candidate['results'])):
+        old = baseline['results'].get(name, {}).get(args.metric)
+        new = candidate['results'].get(name, {}).get(args.metric)
+        if old is None or new is None:
+            change = 'n/a'
+        elif old:
+            change = f'{(new - old) / old * 100:+.1f}%'
+        else:
+            change = '-'
+        print(f"{name:<34}{old if old is not None else '-':>12}{new if new is not None else '-':>12}{change:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,327 @@
+"""In-memory stand-in for firebase_admin and pyrebase, for offline benchmarks.
+
+Implements only the Firestore and Storage calls firebase_api.py makes, with
+a configurable per-commit delay in place of network round trips. install()
+must run before firebase_api is first used.
+"""
+import bisect
+import sys
+import time
+import types
+import uuid
+from datetime import datetime
+
+SERVER_TIMESTAMP = object()
+
+# Seconds added to every batch/transaction commit and document get
+LATENCY = {'commit': 0.0, 'read': 0.0}
+
+STATS = {'reads': 0, 'writes': 0, 'queries': 0, 'commits': 0}
+
+
+class Increment:
+    def __init__(self, value):
+        self.value = value
+
+
+def _resolve(data, current):
+    for field, value in data.items():
+        if value is SERVER_TIMESTAMP:
+            value = datetime.utcnow()
+        elif isinstance(value, Increment):
+            value = (current.get(field) or 0) + value.value
+        current[field] = value
+    return current
+
+
+class DocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+    def get(self, field):
+        return (self._data or {}).get(field)
+
+
+class DocumentReference:
+    def __init__(self, collection, doc_id):
+        self.collection = collection
+        self.id = doc_id
+
+    def get(self, transaction=None):
+        if LATENCY['read']:
+            time.sleep(LATENCY['read'])
+        STATS['reads'] += 1
+        data = self.collection.docs.get(self.id)
+        return DocumentSnapshot(self, dict(data) if data is not None else None)
+
+    def set(self, data, merge=False):
+        STATS['writes'] += 1
+        current = dict(self.collection.docs.get(self.id, {})) if merge else {}
+        self.collection._put(self.id, _resolve(data, current))
+
+    def update(self, data):
+        if self.id not in self.collection.docs:
+            raise KeyError(f'No document to update: {self.id}')
+        self.set(data, merge=True)
+
+    def delete(self):
+        STATS['writes'] += 1
+        self.collection._remove(self.id)
+
+
+class Query:
+    OPERATORS = {
+        '==': lambda value, arg: value == arg,
+        '>=': lambda value, arg: value is not None and value >= arg,
+        '<=': lambda value, arg: value is not None and value <= arg,
+        'in': lambda value, arg: value in arg,
+        'array_contains': lambda value, arg: arg in (value or []),
+        'array_contains_any': lambda value, arg: bool(set(arg) & set(value or [])),
+    }
+
+    def __init__(self, collection, filters=(), order=None, limit=None, after=None, fields=None):
+        self._collection = collection
+        self._filters = list(filters)
+        self._order = order
+        self._limit = limit
+        self._after = after
+        self._fields = fields
+
+    def _copy(self, **changes):
+        query = Query(self._collection, self._filters, self._order, self._limit, self._after, self._fields)
+        for name, value in changes.items():
+            setattr(query, '_' + name, value)
+        return query
+
+    def where(self, field, op, value):
+        return self._copy(filters=self._filters + [(field, self.OPERATORS[op], value)])
+
+    def order_by(self, field, direction='ASCENDING'):
+        return self._copy(order=(field, direction))
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def start_after(self, snapshot):
+        return self._copy(after=snapshot.id)
+
+    def select(self, fields):
+        return self._copy(fields=list(fields))
+
+    def _ids(self):
+        collection = self._collection
+        if self._order and self._order[0] == '__name__':
+            ids = collection._sorted_ids()
+            if self._after is not None:
+                ids = ids[bisect.bisect_right(ids, self._after):]
+            if self._order[1] == 'DESCENDING':
+                ids = ids[::-1]
+        else:
+            ids = list(collection.docs)
+            if self._order:
+                field, direction = self._order
+                ids.sort(key=lambda doc_id: (collection.docs[doc_id].get(field) is None,
+                                             collection.docs[doc_id].get(field) or 0),
+                         reverse=direction == 'DESCENDING')
+        for doc_id in ids:
+            data = collection.docs.get(doc_id)
+            if data is not None and all(test(data.get(field), arg) for field, test, arg in self._filters):
+                yield doc_id
+
+    def stream(self, transaction=None):
+        STATS['queries'] += 1
+        for count, doc_id in enumerate(self._ids()):
+            if self._limit is not None and count >= self._limit:
+                break
+            STATS['reads'] += 1
+            data = self._collection.docs[doc_id]
+            if self._fields is not None:
+                data = {field: data[field] for field in self._fields if field in data}
+            yield DocumentSnapshot(DocumentReference(self._collection, doc_id), dict(data))
+
+    get = stream
+
+    def count(self, alias=None):
+        query = self
+
+        class AggregationResult:
+            def __init__(self, value):
+                self.alias = alias
+                self.value = value
+
+        class AggregationQuery:
+            def get(self):
+                STATS['reads'] += 1
+                return [[AggregationResult(sum(1 for _ in query._ids()))]]
+
+        return AggregationQuery()
+
+
+class CollectionReference(Query):
+    def __init__(self, name):
+        super().__init__(self)
+        self.name = name
+        self.docs = {}
+        self._sorted = None
+
+    def _put(self, doc_id, data):
+        if doc_id not in self.docs:
+            self._sorted = None
+        self.docs[doc_id] = data
+
+    def _remove(self, doc_id):
+        if self.docs.pop(doc_id, None) is not None:
+            self._sorted = None
+
+    def _sorted_ids(self):
+        if self._sorted is None:
+            self._sorted = sorted(self.docs)
+        return self._sorted
+
+    def document(self, doc_id=None):
+        return DocumentReference(self, doc_id or uuid.uuid4().hex[:20])
+
+    def add(self, data):
+        reference = self.document()
+        reference.set(data)
+        return None, reference
+
+
+class WriteBatch:
+    def __init__(self):
+        self._writes = []
+
+    def set(self, reference, data, merge=False):
+        self._writes.append(lambda: reference.set(data, merge=merge))
+
+    def update(self, reference, data):
+        self._writes.append(lambda: reference.update(data))
+
+    def delete(self, reference):
+        self._writes.append(reference.delete)
+
+    def commit(self):
+        if len(self._writes) > 500:
+            raise ValueError('maximum 500 writes allowed per request')
+        if LATENCY['commit']:
+            time.sleep(LATENCY['commit'])
+        STATS['commits'] += 1
+        for write in self._writes:
+            write()
+        self._writes = []
+
+
+class Transaction(WriteBatch):
+    pass
+
+
+class Client:
+    def __init__(self):
+        self._collections = {}
+
+    def collection(self, name):
+        if name not in self._collections:
+            self._collections[name] = CollectionReference(name)
+        return self._collections[name]
+
+    def batch(self):
+        return WriteBatch()
+
+    def transaction(self):
+        return Transaction()
+
+    def reset(self):
+        self._collections.clear()
+
+
+CLIENT = Client()
+
+
+def transactional(function):
+    def run(transaction, *args, **kwargs):
+        result = function(transaction, *args, **kwargs)
+        transaction.commit()
+        return result
+    return run
+
+
+class Blob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.public_url = f'https://storage.invalid/{name}'
+
+    def upload_from_string(self, data, content_type=None):
+        self.bucket.objects[self.name] = data if isinstance(data, bytes) else data.encode()
+
+    def upload_from_file(self, file_obj, content_type=None, size=None, rewind=False):
+        self.bucket.objects[self.name] = file_obj.read()
+
+    def upload_from_filename(self, filename, content_type=None):
+        with open(filename, 'rb') as f:
+            self.bucket.objects[self.name] = f.read()
+
+    def make_public(self):
+        pass
+
+    def delete(self):
+        self.bucket.objects.pop(self.name, None)
+
+
+class Bucket:
+    def __init__(self):
+        self.objects = {}
+
+    def blob(self, name, chunk_size=None):
+        return Blob(self, name)
+
+
+BUCKET = Bucket()
+
+
+def reset():
+    """Drop all fake Firestore documents, Storage objects and counters"""
+    CLIENT.reset()
+    BUCKET.objects.clear()
+    for key in STATS:
+        STATS[key] = 0
+
+
+def install(commit_latency=0.0, read_latency=0.0):
+    """Register the fake SDK modules in sys.modules"""
+    LATENCY['commit'] = commit_latency
+    LATENCY['read'] = read_latency
+
+    firebase_admin = types.ModuleType('firebase_admin')
+    firebase_admin._apps = {}
+    firebase_admin.initialize_app = lambda *args, **kwargs: firebase_admin._apps.setdefault('[DEFAULT]', object())
+
+    credentials = types.ModuleType('firebase_admin.credentials')
+    credentials.Certificate = lambda source: source
+
+    firestore = types.ModuleType('firebase_admin.firestore')
+    firestore.client = lambda: CLIENT
+    firestore.SERVER_TIMESTAMP = SERVER_TIMESTAMP
+    firestore.Increment = Increment
+    firestore.transactional = transactional
+    firestore.Query = types.SimpleNamespace(ASCENDING='ASCENDING', DESCENDING='DESCENDING')
+
+    storage = types.ModuleType('firebase_admin.storage')
+    storage.bucket = lambda: BUCKET
+
+    auth = types.ModuleType('firebase_admin.auth')
+
+    pyrebase = types.ModuleType('pyrebase')
+    pyrebase.initialize_app = lambda config: types.SimpleNamespace(config=config)
+
+    for module in (credentials, firestore, storage, auth):
+        setattr(firebase_admin, module.__name__.rsplit('.', 1)[1], module)
+        sys.modules[module.__name__] = module
+    sys.modules['firebase_admin'] = firebase_admin
+    sys.modules['pyrebase'] = pyrebase
@@ -0,0 +1,87 @@
+"""Measure module import time for the application and the Firebase stack.
+
+Each target is imported in a fresh interpreter several times and the median
+wall time is reported, together with the slowest modules from
+`python -X importtime`. Run from the repository root:
+
+    python benchmarks/import_time.py --runs 5 --output import_time.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    'app': 'import app',
+    'firebase_routes': 'import firebase_routes',
+    'firebase_first_use': 'import firebase_api; firebase_api.get_firebase_api()',
+}
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(.+)$')
+
+
+def _run(code, extra_args=()):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, *extra_args, '-c', code],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    return time.perf_counter() - started, completed
+
+
+def slowest_modules(code, limit=10):
+    """Modules imported directly by the target, by cumulative import time in milliseconds"""
+    _, completed = _run(code, ('-X', 'importtime'))
+    modules = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match and len(match.group(3)) == 3:
+            modules.append((match.group(4).strip(), int(match.group(2)) / 1000))
+    modules.sort(key=lambda item: item[1], reverse=True)
+    return [{'module': name, 'cumulative_ms': round(ms, 2)} for name, ms in modules[:limit]]
+
+
+def measure(code, runs):
+    baseline = statistics.median(_run('pass')[0] for _ in range(runs))
+    timings = []
+    for _ in range(runs):
+        elapsed, completed = _run(code)
+        if completed.returncode != 0:
+            return {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'failed'}
+        timings.append(elapsed)
+    return {
+        'median_ms': round((statistics.median(timings) - baseline) * 1000, 2),
+        'min_ms': round((min(timings) - baseline) * 1000, 2),
+        'runs': runs,
+        'slowest_modules': slowest_modules(code),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--target', action='append', choices=sorted(TARGETS),
+                        help='Target to measure (default: all)')
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    args = parser.parse_args()
+
+    results = {
+        'python': sys.version.split()[0],
+        'targets': {name: measure(TARGETS[name], args.runs) for name in (args.target or TARGETS)},
+    }
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""Latency and throughput benchmarks for the main views, APIs and Firestore sync.
+
+Everything runs in-process through the Flask test client against a fresh
+SQLite database (or --database-url) seeded with synthetic alumni, and the
+Firestore routes run against benchmarks/fake_firebase.py, so no network is
+needed. Results are written as JSON keyed by scenario, with the git commit
+recorded so runs can be compared with benchmarks/compare.py:
+
+    python benchmarks/run_benchmarks.py --rows 100k --output results-100k.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS_DIR)
+
+ADMIN_USERNAME = 'benchmark-admin'
+ADMIN_PASSWORD = 'benchmark-password'
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def summarize(timings, statuses, units=None):
+    """Latency percentiles in milliseconds plus request throughput"""
+    ordered = sorted(timings)
+    total = sum(timings)
+    result = {
+        'iterations': len(timings),
+        'mean_ms': round(statistics.mean(timings) * 1000, 3),
+        'p50_ms': round(_percentile(ordered, 0.50) * 1000, 3),
+        'p95_ms': round(_percentile(ordered, 0.95) * 1000, 3),
+        'p99_ms': round(_percentile(ordered, 0.99) * 1000, 3),
+        'min_ms': round(ordered[0] * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+        'requests_per_second': round(len(timings) / total, 2) if total else None,
+        'status_codes': {str(code): statuses.count(code) for code in sorted(set(statuses))},
+    }
+    if units:
+        result['rows_per_second'] = round(units / total, 1) if total else None
+    return result
+
+
+class Benchmark:
+    """Holds the app, a logged-in client and the per-scenario request factories"""
+
+    def __init__(self, app, rows, seed):
+        self.app = app
+        self.rows = rows
+        self.rng = random.Random(seed)
+        self.client = app.test_client()
+        self.submitted = 0
+        self.departments = []
+
+    def login(self):
+        response = self.client.post('/login', data={'username': ADMIN_USERNAME, 'password': ADMIN_PASSWORD})
+        if response.status_code != 302:
+            raise RuntimeError('Benchmark login failed')
+
+    def _new_values(self):
+        from synthetic_data import generate_alumni
+        self.submitted += 1
+        # Offset well past the seeded rows so emails and student ids stay unique
+        return next(generate_alumni(1, seed=self.submitted, start=self.rows * 10 + self.submitted))
+
+    # Scenarios: each returns a response (and optionally a row count for throughput)
+    def dashboard(self):
+        return self.client.get('/')
+
+    def alumni_list(self):
+        return self.client.get('/alumni')
+
+    def alumni_list_filtered(self):
+        department = self.rng.choice(self.departments)
+        return self.client.get('/alumni', query_string={'department': department, 'sort': 'graduation_year'})
+
+    def alumni_by_department(self):
+        return self.client.get('/alumni/by-department')
+
+    def alumni_by_department_members(self):
+        department = self.rng.choice(self.departments)
+        return self.client.get('/alumni/by-department/members', query_string={'department': department})
+
+    def alumni_profile(self):
+        return self.client.get(f'/alumni/{self.rng.randint(1, self.rows)}')
+
+    def api_alumni_submit(self):
+        from synthetic_data import submit_record
+        return self.client.post('/api/alumni/submit', json=submit_record(self._new_values()))
+
+    def api_registration_portal_submit(self):
+        from synthetic_data import portal_record
+        return self.client.post('/api/registration-portal/submit', json=portal_record(self._new_values()))
+
+    def firestore_sync_to_full(self):
+        return self.client.post('/api/firebase/sync/to-firestore'), self.rows
+
+    def firestore_sync_to_incremental(self):
+        return self.client.post('/api/firebase/sync/to-firestore', query_string={'mode': 'incremental'}), None
+
+    def firestore_sync_from(self):
+        return self.client.post('/api/firebase/sync/from-firestore'), self.rows
+
+
+# (scenario, iterations multiplier); full syncs touch every row so they run once
+SCENARIOS = [
+    ('dashboard', 1),
+    ('alumni_list', 1),
+    ('alumni_list_filtered', 1),
+    ('alumni_by_department', 1),
+    ('alumni_by_department_members', 1),
+    ('alumni_profile', 1),
+    ('api_alumni_submit', 1),
+    ('api_registration_portal_submit', 1),
+    ('firestore_sync_to_full', 0),
+    ('firestore_sync_to_incremental', 0.2),
+    ('firestore_sync_from', 0),
+]
+
+
+def run_scenario(bench, name, iterations, warmup):
+    scenario = getattr(bench, name)
+    timings = []
+    statuses = []
+    units = 0
+    # Sync routes log per chunk; keep that out of the benchmark output
+    with contextlib.redirect_stdout(io.StringIO()):
+        for attempt in range(warmup + iterations):
+            started = time.perf_counter()
+            result = scenario()
+            response, rows = result if isinstance(result, tuple) else (result, None)
+            response.get_data()
+            elapsed = time.perf_counter() - started
+            if attempt >= warmup:
+                timings.append(elapsed)
+                statuses.append(response.status_code)
+                units += rows or 0
+    return summarize(timings, statuses, units or None)
+
+
+def main():
+    sys.path.insert(0, BENCHMARKS_DIR)
+    from synthetic_data import parse_rows
+
+    parser = argparse.ArgumentParser(description='Run the alumni portal benchmark suite')
+    parser.add_argument('--rows', type=parse_rows, default='10k', help='10k, 100k, 1m or a row count')
+    parser.add_argument('--iterations', type=int, default=50, help='Timed requests per scenario')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--scenario', action='append', choices=[name for name, _ in SCENARIOS],
+                        help='Run only these scenarios (default: all)')
+    parser.add_argument('--database-url', help='Benchmark against this database instead of a temporary SQLite file')
+    parser.add_argument('--firestore-latency-ms', type=float, default=5.0,
+                        help='Simulated round trip added to each fake Firestore commit')
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    args = parser.parse_args()
+
+    temp_dir = None
+    if not args.database_url:
+        temp_dir = tempfile.mkdtemp(prefix='alumni-bench-')
+        args.database_url = 'sqlite:///' + os.path.join(temp_dir, 'bench.db')
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ.setdefault('FIREBASE_PRIVATE_KEY', 'benchmark')
+    os.environ['REGISTRATION_QUEUE_ENABLED'] = 'False'
+
+    import fake_firebase
+    fake_firebase.install(commit_latency=args.firestore_latency_ms / 1000)
+
+    sys.path.insert(0, ROOT)
+    from app import app
+    from firebase_routes import firebase_bp
+    from models import db, User, Alumni
+    from synthetic_data import seed_database
+
+    if 'firebase' not in app.blueprints:
+        app.register_blueprint(firebase_bp)
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        db.create_all()
+        seeded_at = time.perf_counter()
+        existing = Alumni.query.count()
+        if existing == 0:
+            print(f'Seeding {args.rows} alumni...', file=sys.stderr)
+            seed_database(args.rows, seed=args.seed)
+        elif existing != args.rows:
+            parser.error(f'{args.database_url} already holds {existing} alumni; use an empty database')
+        seed_seconds = time.perf_counter() - seeded_at
+        if not User.query.filter_by(username=ADMIN_USERNAME).first():
+            user = User(username=ADMIN_USERNAME)
+            user.set_password(ADMIN_PASSWORD)
+            db.session.add(user)
+            db.session.commit()
+        departments = [row[0] for row in db.session.query(Alumni.department).distinct()]
+        dialect = db.engine.dialect.name
+
+    bench = Benchmark(app, args.rows, args.seed)
+    bench.departments = departments
+    bench.login()
+
+    selected = args.scenario or [name for name, _ in SCENARIOS]
+    results = {}
+    for name, multiplier in SCENARIOS:
+        if name not in selected:
+            continue
+        iterations = max(1, int(args.iterations * multiplier))
+        warmup = args.warmup if multiplier else 0
+        print(f'{name}: {iterations} iterations', file=sys.stderr)
+        results[name] = run_scenario(bench, name, iterations, warmup)
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'rows': args.rows,
+            'seed': args.seed,
+            'iterations': args.iterations,
+            'dialect': dialect,
+            'firestore_latency_ms': args.firestore_latency_ms,
+            'seed_seconds': round(seed_seconds, 2),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""Synthetic Alumni datasets for benchmarks and load tests.
+
+Rows are deterministic for a given seed, so runs against the same size are
+comparable across commits. Either seed a database directly:
+
+    python benchmarks/synthetic_data.py --rows 100000 --database-url sqlite:///bench.db
+
+or write NDJSON in the /api/alumni/submit record format for /api/alumni/bulk:
+
+    python benchmarks/synthetic_data.py --rows 10000 --ndjson alumni.ndjson
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PRESET_SIZES = {'10k': 10000, '100k': 100000, '1m': 1000000}
+
+# (department, short code, degrees offered, relative size)
+DEPARTMENTS = [
+    ('Computer Science and Engineering', 'CS', ['B.E.', 'M.Tech'], 22),
+    ('Information Science and Engineering', 'IS', ['B.E.'], 12),
+    ('Artificial Intelligence and Machine Learning', 'AI', ['B.E.', 'M.Tech'], 10),
+    ('Electronics and Communication Engineering', 'EC', ['B.E.', 'M.Tech'], 14),
+    ('Electrical and Electronics Engineering', 'EE', ['B.E.'], 7),
+    ('Mechanical Engineering', 'ME', ['B.E.', 'M.Tech'], 11),
+    ('Civil Engineering', 'CV', ['B.E.', 'M.Tech'], 8),
+    ('Robotics and Automation', 'RA', ['B.E.'], 3),
+    ('Business Administration', 'BA', ['MBA'], 8),
+    ('Computer Applications', 'CA', ['MCA', 'BCA'], 5),
+]
+
+FIRST_NAMES = [
+    'Aarav', 'Aditi', 'Akash', 'Ananya', 'Arjun', 'Bhavana', 'Chaitra', 'Darshan', 'Deepa', 'Divya',
+    'Gautam', 'Harsha', 'Ishaan', 'Kavya', 'Kiran', 'Lakshmi', 'Manoj', 'Meghana', 'Nikhil', 'Nisha',
+    'Pooja', 'Pranav', 'Rahul', 'Rakshitha', 'Rohan', 'Sahana', 'Sanjay', 'Shreya', 'Sneha', 'Suhas',
+    'Tanvi', 'Tejas', 'Varun', 'Vidya', 'Vikram', 'Yash', 'Zoya', 'Fathima', 'Joel', 'Mohammed',
+]
+
+LAST_NAMES = [
+    'Acharya', 'Bhat', 'Dsouza', 'Gowda', 'Hegde', 'Iyer', 'Kamath', 'Khan', 'Kulkarni', 'Kumar',
+    'Mendonca', 'Nair', 'Naik', 'Pai', 'Patil', 'Prabhu', 'Rao', 'Reddy', 'Salian', 'Shenoy',
+    'Shetty', 'Sharma', 'Poojary', 'Fernandes', 'Menon', 'Joshi', 'Kini', 'Rai', 'Shaikh', 'Pinto',
+]
+
+EMPLOYERS = [
+    ('Infosys', 'Information Technology'), ('TCS', 'Information Technology'), ('Wipro', 'Information Technology'),
+    ('Accenture', 'Consulting'), ('Deloitte', 'Consulting'), ('Bosch', 'Automotive'),
+    ('Mercedes-Benz R&D', 'Automotive'), ('Larsen & Toubro', 'Construction'), ('Siemens', 'Manufacturing'),
+    ('Amazon', 'E-commerce'), ('Google', 'Internet'), ('Microsoft', 'Software'), ('Intel', 'Semiconductors'),
+    ('Qualcomm', 'Semiconductors'), ('HDFC Bank', 'Banking'), ('Flipkart', 'E-commerce'),
+    ('Zoho', 'Software'), ('ISRO', 'Aerospace'), ('Robert Bosch Engineering', 'Automotive'), ('Startup', 'Software'),
+]
+
+JOB_TITLES = [
+    'Software Engineer', 'Senior Software Engineer', 'Data Scientist', 'Product Manager', 'Design Engineer',
+    'Site Engineer', 'Project Manager', 'Business Analyst', 'DevOps Engineer', 'Hardware Engineer',
+    'Consultant', 'Research Scientist', 'Engineering Manager', 'QA Engineer', 'Embedded Engineer',
+]
+
+CITIES = [
+    ('Bengaluru', 'Karnataka', 'India'), ('Mangaluru', 'Karnataka', 'India'), ('Mysuru', 'Karnataka', 'India'),
+    ('Pune', 'Maharashtra', 'India'), ('Mumbai', 'Maharashtra', 'India'), ('Hyderabad', 'Telangana', 'India'),
+    ('Chennai', 'Tamil Nadu', 'India'), ('Kochi', 'Kerala', 'India'), ('Dubai', 'Dubai', 'UAE'),
+    ('San Jose', 'California', 'USA'), ('Toronto', 'Ontario', 'Canada'), ('Munich', 'Bavaria', 'Germany'),
+]
+
+SKILLS = [
+    'Python', 'Java', 'C++', 'JavaScript', 'React', 'Node.js', 'SQL', 'PostgreSQL', 'AWS', 'Azure',
+    'Docker', 'Kubernetes', 'Terraform', 'Machine Learning', 'TensorFlow', 'PyTorch', 'AutoCAD',
+    'SolidWorks', 'ANSYS', 'MATLAB', 'Embedded C', 'VLSI', 'Power BI', 'Excel', 'Go', 'Rust',
+]
+
+LANGUAGES = ['English', 'Kannada', 'Hindi', 'Tulu', 'Konkani', 'Malayalam', 'Tamil', 'Telugu', 'Marathi', 'German']
+
+INTERESTS = [
+    'Mentoring', 'Entrepreneurship', 'Open Source', 'Research', 'Guest Lectures', 'Placements',
+    'Sports', 'Photography', 'Music', 'Social Work', 'Startups', 'Higher Studies',
+]
+
+
+def generate_alumni(rows, seed=42, start=0):
+    """Yield `rows` Alumni column dicts; identical for the same seed and start"""
+    rng = random.Random(seed)
+    weights = [size for _, _, _, size in DEPARTMENTS]
+    this_year = date.today().year
+    for i in range(start, start + rows):
+        department, code, degrees, _ = rng.choices(DEPARTMENTS, weights=weights)[0]
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        graduation_year = rng.randint(this_year - 25, this_year)
+        experience = max(0, this_year - graduation_year - rng.randint(0, 2))
+        employed = experience > 0 and rng.random() < 0.9
+        employer, industry = rng.choice(EMPLOYERS) if employed else ('', '')
+        city, state, country = rng.choice(CITIES)
+        yield {
+            'first_name': first_name,
+            'last_name': last_name,
+            'email': f'{first_name}.{last_name}.{i}@example.com'.lower(),
+            'phone': f'+91 9{rng.randint(100000000, 999999999)}',
+            'date_of_birth': date(graduation_year - 22, 1, 1) + timedelta(days=rng.randint(0, 364)),
+            'gender': rng.choice(['Male', 'Female']),
+            'degree': rng.choice(degrees),
+            'department': department,
+            'graduation_year': graduation_year,
+            'student_id': f'{graduation_year % 100:02d}{code}{i:08d}',
+            'current_employer': employer,
+            'job_title': rng.choice(JOB_TITLES) if employed else '',
+            'industry': industry,
+            'years_of_experience': experience,
+            'linkedin': f'https://www.linkedin.com/in/{first_name.lower()}-{last_name.lower()}-{i}',
+            'current_city': city,
+            'state': state,
+            'country': country,
+            'technical_skills': ', '.join(rng.sample(SKILLS, rng.randint(1, 6))),
+            'languages_known': ', '.join(rng.sample(LANGUAGES, rng.randint(1, 4))),
+            'areas_of_interest': ', '.join(rng.sample(INTERESTS, rng.randint(0, 3))),
+        }
+
+
+def submit_record(values):
+    """Convert generated column values to the JSON body /api/alumni/submit accepts"""
+    record = dict(values)
+    record['date_of_birth'] = values['date_of_birth'].strftime('%m/%d/%Y')
+    return record
+
+
+def portal_record(values):
+    """Convert generated column values to a registration-portal payload"""
+    return {
+        'fullName': f"{values['first_name']} {values['last_name']}",
+        'email': values['email'],
+        'phone': values['phone'],
+        'dateOfBirth': values['date_of_birth'].isoformat(),
+        'gender': values['gender'],
+        'degree': values['degree'],
+        'department': values['department'],
+        'graduationYear': values['graduation_year'],
+        'studentId': values['student_id'],
+        'company': values['current_employer'],
+        'currentJob': values['job_title'],
+        'industry': values['industry'],
+        'yearsOfExperience': values['years_of_experience'],
+        'linkedin': values['linkedin'],
+        'location': values['current_city'],
+        'state': values['state'],
+        'country': values['country'],
+        'technicalSkills': values['technical_skills'],
+        'languagesKnown': values['languages_known'],
+        'interests': values['areas_of_interest'],
+    }
+
+
+def seed_database(rows, seed=42, batch_size=5000, with_tags=True, progress=None):
+    """Bulk insert generated rows into the configured database; needs an app context"""
+    from sqlalchemy import insert
+    from models import db, Alumni
+    from change_tracking import mark_alumni_changed
+
+    inserted = 0
+    batch = []
+    now = datetime.utcnow()
+    for values in generate_alumni(rows, seed=seed):
+        values['created_at'] = now
+        values['updated_at'] = now
+        batch.append(values)
+        if len(batch) >= batch_size:
+            db.session.execute(insert(Alumni.__table__), batch)
+            db.session.commit()
+            inserted += len(batch)
+            batch = []
+            if progress:
+                progress(inserted)
+    if batch:
+        db.session.execute(insert(Alumni.__table__), batch)
+        inserted += len(batch)
+    mark_alumni_changed()
+    db.session.commit()
+
+    if with_tags:
+        from alumni_tags import backfill_alumni_tags
+        backfill_alumni_tags(batch_size=batch_size)
+    return inserted
+
+
+def parse_rows(value):
+    """Accept a preset name (10k, 100k, 1m) or a plain row count"""
+    return PRESET_SIZES.get(value.lower()) or int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic alumni data')
+    parser.add_argument('--rows', type=parse_rows, default='10k', help='10k, 100k, 1m or a row count')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-url', help='Seed this database (tables are created if missing)')
+    parser.add_argument('--ndjson', help='Write /api/alumni/submit records to this file instead')
+    parser.add_argument('--no-tags', action='store_true', help='Skip building the skill/language/interest links')
+    args = parser.parse_args()
+
+    if args.ndjson:
+        with open(args.ndjson, 'w') as f:
+            for values in generate_alumni(args.rows, seed=args.seed):
+                f.write(json.dumps(submit_record(values)) + '\n')
+        print(f'Wrote {args.rows} records to {args.ndjson}')
+        return
+
+    if not args.database_url:
+        parser.error('--database-url or --ndjson is required')
+    os.environ['DATABASE_URL'] = args.database_url
+    sys.path.insert(0, ROOT)
+    from app import app
+    from models import db
+
+    started = time.perf_counter()
+    with app.app_context():
+        db.create_all()
+        inserted = seed_database(
+            args.rows, seed=args.seed, with_tags=not args.no_tags,
+            progress=lambda count: print(f'  {count} rows', file=sys.stderr)
+        )
+    print(f'Inserted {inserted} alumni in {time.perf_counter() - started:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
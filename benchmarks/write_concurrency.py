@@ -0,0 +1,191 @@
+"""Concurrent write throughput under each database engine profile.
+
+Starts several worker processes, as gunicorn would, against one SQLite
+file. Each worker runs a mix of registration-portal submits and profile
+reads through the Flask test client for a fixed time. The run is repeated
+for each profile (library defaults vs. the tuned sqlite profile) on
+identical copies of the seeded database:
+
+    python benchmarks/write_concurrency.py --rows 10k --workers 4 --duration 10
+
+Against Postgres, pass --database-url and compare e.g. --profiles default postgres
+(the database is reused as-is, so seed it first with synthetic_data.py).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from run_benchmarks import ADMIN_USERNAME, ADMIN_PASSWORD, _git_commit, summarize  # noqa: E402
+
+
+def _worker(worker_id, database_url, profile, rows, duration, write_ratio, start_event, results):
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['DATABASE_ENGINE_PROFILE'] = profile
+    os.environ['REGISTRATION_QUEUE_ENABLED'] = 'False'
+    os.environ['METRICS_DB_PATH'] = ''
+    sys.path.insert(0, ROOT)
+    import io
+    import contextlib
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import app
+        from synthetic_data import generate_alumni, portal_record
+    app.config['TESTING'] = True
+    client = app.test_client()
+    if client.post('/login', data={'username': ADMIN_USERNAME, 'password': ADMIN_PASSWORD}).status_code != 302:
+        raise RuntimeError('Benchmark login failed')
+
+    rng = random.Random(worker_id)
+    # Each worker draws unique emails and student ids from its own range
+    new_rows = generate_alumni(10 ** 6, seed=worker_id, start=rows * 10 + worker_id * 10 ** 6)
+    timings = {'write': [], 'read': []}
+    statuses = {'write': [], 'read': []}
+
+    start_event.wait()
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        kind = 'write' if rng.random() < write_ratio else 'read'
+        started = time.perf_counter()
+        if kind == 'write':
+            response = client.post('/api/registration-portal/submit', json=portal_record(next(new_rows)))
+        else:
+            response = client.get(f'/alumni/{rng.randint(1, rows)}')
+        response.get_data()
+        timings[kind].append(time.perf_counter() - started)
+        statuses[kind].append(response.status_code)
+    results.put((timings, statuses))
+
+
+def run_profile(database_url, profile, args):
+    context = multiprocessing.get_context('spawn')
+    start_event = context.Event()
+    results = context.Queue()
+    workers = [
+        context.Process(target=_worker, args=(worker_id, database_url, profile, args.rows, args.duration,
+                                              args.write_ratio, start_event, results))
+        for worker_id in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    # Give every worker time to import the app and log in before the clock starts
+    time.sleep(args.startup_seconds)
+    start_event.set()
+    collected = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    report = {}
+    for kind in ('write', 'read'):
+        timings = [value for worker_timings, _ in collected for value in worker_timings[kind]]
+        statuses = [value for _, worker_statuses in collected for value in worker_statuses[kind]]
+        if timings:
+            report[kind] = summarize(timings, statuses)
+            # Aggregate throughput across workers over the wall-clock window
+            report[kind]['operations_per_second'] = round(len(timings) / args.duration, 1)
+    return report
+
+
+def _seed(database_url, rows, seed):
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['DATABASE_ENGINE_PROFILE'] = 'default'
+    os.environ['REGISTRATION_QUEUE_ENABLED'] = 'False'
+    sys.path.insert(0, ROOT)
+    from app import app
+    from models import db, User, Alumni
+    from synthetic_data import seed_database
+
+    with app.app_context():
+        db.create_all()
+        if Alumni.query.count() == 0:
+            print(f'Seeding {rows} alumni...', file=sys.stderr)
+            seed_database(rows, seed=seed)
+        if not User.query.filter_by(username=ADMIN_USERNAME).first():
+            user = User(username=ADMIN_USERNAME)
+            user.set_password(ADMIN_PASSWORD)
+            db.session.add(user)
+            db.session.commit()
+        db.session.remove()
+        db.engine.dispose()
+
+
+def main():
+    from synthetic_data import parse_rows
+
+    parser = argparse.ArgumentParser(description='Compare concurrent write throughput across engine profiles')
+    parser.add_argument('--rows', type=parse_rows, default='10k', help='10k, 100k, 1m or a row count')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent worker processes')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per profile')
+    parser.add_argument('--write-ratio', type=float, default=0.5, help='Fraction of operations that are submits')
+    parser.add_argument('--startup-seconds', type=float, default=5.0, help='Time allowed for workers to start')
+    parser.add_argument('--profiles', nargs='+', default=['default', 'sqlite'],
+                        help='Engine profiles to compare (see engine_profiles.PROFILES)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-url', help='Run against this database instead of temporary SQLite copies')
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    args = parser.parse_args()
+
+    temp_dir = None
+    if args.database_url:
+        urls = {profile: args.database_url for profile in args.profiles}
+    else:
+        temp_dir = tempfile.mkdtemp(prefix='alumni-bench-')
+        template = os.path.join(temp_dir, 'template.db')
+        _seed('sqlite:///' + template, args.rows, args.seed)
+        urls = {}
+        for profile in args.profiles:
+            # A fresh copy per profile; the default profile must start in rollback-journal mode
+            path = os.path.join(temp_dir, f'{profile}.db')
+            shutil.copyfile(template, path)
+            urls[profile] = 'sqlite:///' + path
+
+    results = {}
+    try:
+        for profile in args.profiles:
+            print(f'{profile}: {args.workers} workers for {args.duration}s', file=sys.stderr)
+            results[profile] = run_profile(urls[profile], profile, args)
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    baseline = results.get(args.profiles[0], {}).get('write')
+    for profile in args.profiles[1:]:
+        writes = results[profile].get('write')
+        if baseline and writes and baseline['operations_per_second']:
+            writes['speedup_vs_' + args.profiles[0]] = round(
+                writes['operations_per_second'] / baseline['operations_per_second'], 2
+            )
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'rows': args.rows,
+            'workers': args.workers,
+            'duration_seconds': args.duration,
+            'write_ratio': args.write_ratio,
+            'database': 'postgresql' if args.database_url and 'postgres' in args.database_url else 'sqlite',
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+import threading
+from sqlalchemy import event, update, insert, select
+from sqlalchemy.orm import Session
+from models import db, Alumni, TableVersion
+
+ALUMNI_TABLE = 'alumni'
+
+_lock = threading.Lock()
+_table_ready = False
+
+# In-process cache of dashboard aggregates, tagged with the version they were computed at
+_dashboard_cache = {'version': None, 'data': None}
+
+
+def ensure_version_table(connection):
+    """Create the table_version table on databases that predate it"""
+    global _table_ready
+    if not _table_ready:
+        TableVersion.__table__.create(connection, checkfirst=True)
+        _table_ready = True
+
+
+def bump_version(connection, table_name=ALUMNI_TABLE):
+    """Increment a table's change version inside the caller's transaction"""
+    ensure_version_table(connection)
+    result = connection.execute(
+        update(TableVersion.__table__)
+        .where(TableVersion.table_name == table_name)
+        .values(version=TableVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(TableVersion.__table__).values(table_name=table_name, version=1))
+
+
+def get_version(table_name=ALUMNI_TABLE):
+    """Return the current change version of a table (0 if it was never written)"""
+    connection = db.session.connection()
+    ensure_version_table(connection)
+    version = connection.execute(
+        select(TableVersion.version).where(TableVersion.table_name == table_name)
+    ).scalar()
+    return version or 0
+
+
+def get_version_info(table_name=ALUMNI_TABLE):
+    """Return (version, updated_at) for a table; updated_at is None if it was never written"""
+    connection = db.session.connection()
+    ensure_version_table(connection)
+    row = connection.execute(
+        select(TableVersion.version, TableVersion.updated_at).where(TableVersion.table_name == table_name)
+    ).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+def mark_alumni_changed():
+    """Record an Alumni change made outside the ORM unit of work (e.g. Core bulk inserts)"""
+    bump_version(db.session.connection())
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_alumni_changes(session, flush_context):
+    # Any ORM insert, update or delete of an Alumni row moves the version on, so
+    # every write path (admin forms, submit APIs, Firestore sync) invalidates
+    # the cached aggregates in all worker processes when it commits.
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Alumni):
+            bump_version(session.connection())
+            break
+
+
+def _recent_alumni_dict(alumni):
+    return {
+        'id': alumni.id,
+        'first_name': alumni.first_name,
+        'last_name': alumni.last_name,
+        'department': alumni.department,
+        'graduation_year': alumni.graduation_year,
+        'current_employer': alumni.current_employer,
+        'job_title': alumni.job_title,
+    }
+
+
+def get_dashboard_stats():
+    """Return cached dashboard aggregates, recomputing them only after a write"""
+    version = get_version()
+    with _lock:
+        if _dashboard_cache['version'] == version:
+            return _dashboard_cache['data']
+
+    total_alumni = Alumni.query.count()
+    recent_alumni = Alumni.query.order_by(Alumni.created_at.desc()).limit(5).all()
+    graduation_years = db.session.query(
+        Alumni.graduation_year,
+        db.func.count(Alumni.id)
+    ).group_by(Alumni.graduation_year).all()
+
+    data = {
+        'total_alumni': total_alumni,
+        'recent_alumni': [_recent_alumni_dict(alumni) for alumni in recent_alumni],
+        'graduation_years': [(year, count) for year, count in graduation_years],
+    }
+    with _lock:
+        # Tag with the version read before computing, so a concurrent write
+        # simply causes one more recompute rather than a stale entry.
+        _dashboard_cache['version'] = version
+        _dashboard_cache['data'] = data
+    return data
@@ -0,0 +1,172 @@
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class _GzipStream:
+    def __init__(self, level):
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+def available_encodings():
+    """Content-Encoding token -> stream class, for the codecs importable here"""
+    encodings = {'gzip': _GzipStream}
+    if brotli is not None:
+        encodings['br'] = _BrotliStream
+    if zstandard is not None:
+        encodings['zstd'] = _ZstdStream
+    return encodings
+
+
+def _parse_list(value):
+    if isinstance(value, str):
+        value = value.split(',')
+    return [item.strip().lower() for item in value if item.strip()]
+
+
+class ResponseCompressor:
+    """Compresses eligible responses in an after_request hook.
+
+    A response is compressed when its mimetype is on the allow-list, it has
+    no Content-Encoding yet (e.g. the precompressed /assets files), it is at
+    least min_size bytes and the client accepts one of the configured
+    encodings. Streamed responses are compressed chunk by chunk and flushed
+    after each chunk, so clients still see rows as they are produced.
+    """
+
+    def __init__(self, encodings, levels, mimetypes, min_size):
+        supported = available_encodings()
+        self.encodings = [name for name in _parse_list(encodings) if name in supported]
+        self.streams = {name: supported[name] for name in self.encodings}
+        self.levels = levels
+        self.mimetypes = set(_parse_list(mimetypes))
+        self.min_size = min_size
+
+    def choose_encoding(self):
+        # Highest client quality wins; ties go to the server's preference order
+        best, best_quality = None, 0
+        for name in self.encodings:
+            quality = request.accept_encodings[name]
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    def is_eligible(self, response):
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if response.mimetype not in self.mimetypes:
+            return False
+        if 'Content-Encoding' in response.headers or 'no-transform' in response.headers.get('Cache-Control', ''):
+            return False
+        # File responses (send_file) are left alone; static files are precompressed by build-assets
+        if response.direct_passthrough:
+            return False
+        return response.content_length is None or response.content_length >= self.min_size
+
+    def _stream(self, chunks, stream):
+        for chunk in chunks:
+            if chunk:
+                data = stream.compress(chunk) + stream.flush()
+                if data:
+                    yield data
+        yield stream.finish()
+
+    def __call__(self, response):
+        if request.method == 'HEAD' or not self.is_eligible(response):
+            return response
+        # The body depends on Accept-Encoding from here on, whether or not this client gets it compressed
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose_encoding()
+        if encoding is None:
+            return response
+
+        stream = self.streams[encoding](self.levels[encoding])
+        if response.is_streamed:
+            source = response.response
+            response.response = self._stream(response.iter_encoded(), stream)
+            # The server closes the new iterable; the original still needs closing (e.g. stream_with_context)
+            if hasattr(source, 'close'):
+                response.call_on_close(source.close)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < self.min_size:
+                return response
+            response.set_data(stream.compress(body) + stream.finish())
+
+        response.headers['Content-Encoding'] = encoding
+        # A strong ETag names exact bytes; the encoded body is only semantically the same
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def init_app(app):
+    """Compress large text responses; a no-op when COMPRESSION_ENABLED is false.
+
+    Register this before other after_request hooks: Flask runs them in
+    reverse order, so compression sees the final headers and body.
+    """
+    config = app.config
+    if not config.get('COMPRESSION_ENABLED', True):
+        return None
+    compressor = ResponseCompressor(
+        encodings=config['COMPRESSION_ENCODINGS'],
+        levels={
+            'gzip': config['COMPRESSION_GZIP_LEVEL'],
+            'br': config['COMPRESSION_BROTLI_LEVEL'],
+            'zstd': config['COMPRESSION_ZSTD_LEVEL'],
+        },
+        mimetypes=config['COMPRESSION_MIMETYPES'],
+        min_size=config['COMPRESSION_MIN_SIZE'],
+    )
+    app.after_request(compressor)
+    return compressor
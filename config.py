@@ -14,8 +14,84 @@ class Config:
     SQLALCHEMY_DATABASE_URI = DATABASE_URL or 'sqlite:///alumni.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Engine tuning: auto picks the sqlite or postgres profile from the URL;
+    # set DATABASE_PGBOUNCER=true when connecting through PgBouncer
+    DATABASE_ENGINE_PROFILE = os.getenv('DATABASE_ENGINE_PROFILE', 'auto').lower()
+    DATABASE_PGBOUNCER = os.getenv('DATABASE_PGBOUNCER', 'False').lower() == 'true'
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', '20000'))
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+    SQLITE_POOL_SIZE = int(os.getenv('SQLITE_POOL_SIZE', '5'))
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '5'))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '30000'))
+    
     # Production settings
     DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     
+    # Per-request SQL statement counting: off, log or raise (log by default in debug mode)
+    QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'log' if DEBUG else 'off').lower()
+    QUERY_BUDGET_DEFAULT = int(os.getenv('QUERY_BUDGET_DEFAULT')) if os.getenv('QUERY_BUDGET_DEFAULT') else None
+    QUERY_REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', '5'))
+    
+    # Password hashing runs on a small bounded pool; stored hashes using other
+    # parameters are upgraded on the next successful login
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', '8'))
+    
+    # Reverse proxies in front of the app (Render adds one); 0 when clients connect directly.
+    # The per-address login throttle keys on the client address this recovers.
+    PROXY_FIX_X_FOR = int(os.getenv('PROXY_FIX_X_FOR', '0'))
+    
+    # Login throttling: token buckets per username and per client address
+    LOGIN_USERNAME_BURST = int(os.getenv('LOGIN_USERNAME_BURST', '5'))
+    LOGIN_USERNAME_PER_MINUTE = float(os.getenv('LOGIN_USERNAME_PER_MINUTE', '1'))
+    LOGIN_IP_BURST = int(os.getenv('LOGIN_IP_BURST', '20'))
+    LOGIN_IP_PER_MINUTE = float(os.getenv('LOGIN_IP_PER_MINUTE', '10'))
+    
+    # Token accepted by the bulk ingest API in addition to an admin session
+    BULK_INGEST_TOKEN = os.getenv('BULK_INGEST_TOKEN')
+    
+    # Write-behind queue for public registration submissions
+    REGISTRATION_QUEUE_ENABLED = os.getenv('REGISTRATION_QUEUE_ENABLED', 'False').lower() == 'true'
+    REGISTRATION_QUEUE_PATH = os.getenv('REGISTRATION_QUEUE_PATH', 'registration_queue.db')
+    REGISTRATION_QUEUE_BATCH_SIZE = int(os.getenv('REGISTRATION_QUEUE_BATCH_SIZE', '200'))
+    REGISTRATION_QUEUE_POLL_INTERVAL = float(os.getenv('REGISTRATION_QUEUE_POLL_INTERVAL', '1.0'))
+    
+    # Prometheus metrics; workers on one host aggregate through this SQLite file
+    METRICS_DB_PATH = os.getenv('METRICS_DB_PATH', 'metrics.db')
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '5.0'))
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    
+    # Bloom filters that let new emails/student ids skip the duplicate lookup;
+    # the capacity grows to twice the stored alumni when the filters are warmed
+    DUPLICATE_FILTER_ENABLED = os.getenv('DUPLICATE_FILTER_ENABLED', 'True').lower() == 'true'
+    DUPLICATE_FILTER_CAPACITY = int(os.getenv('DUPLICATE_FILTER_CAPACITY', '100000'))
+    DUPLICATE_FILTER_ERROR_RATE = float(os.getenv('DUPLICATE_FILTER_ERROR_RATE', '0.01'))
+    
+    # Idempotency-Key support on the public submit APIs: stored responses are
+    # replayed for the TTL; an in-flight key is reclaimable after the lock timeout
+    IDEMPOTENCY_TTL_SECONDS = int(os.getenv('IDEMPOTENCY_TTL_SECONDS', '86400'))
+    IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv('IDEMPOTENCY_LOCK_TIMEOUT', '60'))
+    IDEMPOTENCY_PURGE_INTERVAL = int(os.getenv('IDEMPOTENCY_PURGE_INTERVAL', '300'))
+    
+    # Response compression for HTML, JSON and exports; br and zstd are used when
+    # the brotli / zstandard packages are installed
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True').lower() == 'true'
+    COMPRESSION_ENCODINGS = os.getenv('COMPRESSION_ENCODINGS', 'br,zstd,gzip')
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    COMPRESSION_MIMETYPES = os.getenv(
+        'COMPRESSION_MIMETYPES',
+        'text/html,text/css,text/plain,text/csv,text/xml,application/json,'
+        'application/javascript,application/x-ndjson,image/svg+xml'
+    )
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+    COMPRESSION_BROTLI_LEVEL = int(os.getenv('COMPRESSION_BROTLI_LEVEL', '4'))
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv('COMPRESSION_ZSTD_LEVEL', '3'))
+    
     # CORS settings
     ALLOWED_ORIGINS = os.getenv('ALLOWED_ORIGINS', '*') 
\ No newline at end of file
@@ -3,6 +3,20 @@
 const apiBaseFromQuery = new URLSearchParams(location.search).get('api');
 const API_BASE = apiBaseFromQuery || (typeof window !== 'undefined' && window.API_BASE) || 'https://REPLACE_WITH_BACKEND_HOST';
 
+// Resubmitting the same form data reuses its Idempotency-Key, so a retry
+// after a timeout gets the original result instead of a second registration
+let submission = { payload: null, key: null };
+
+function idempotencyKeyFor(payload) {
+  if (submission.payload !== payload) {
+    const key = (window.crypto && typeof window.crypto.randomUUID === 'function')
+      ? window.crypto.randomUUID()
+      : Date.now().toString(36) + '-' + Math.random().toString(36).slice(2);
+    submission = { payload, key };
+  }
+  return submission.key;
+}
+
 const form = document.getElementById('alumniForm');
 if (form) {
   form.addEventListener('submit', async function (e) {
@@ -15,10 +29,11 @@ if (form) {
     });
 
     try {
+      const payload = JSON.stringify(data);
       const response = await fetch(`${API_BASE}/api/alumni/submit`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(data),
+        headers: { 'Content-Type': 'application/json', 'Idempotency-Key': idempotencyKeyFor(payload) },
+        body: payload,
       });
 
       const result = await response.json().catch(() => ({}));
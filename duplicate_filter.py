@@ -0,0 +1,206 @@
+import hashlib
+import math
+import threading
+from sqlalchemy import event, select, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models import db, Alumni
+from sql_helpers import insert_ignoring_conflicts
+from change_tracking import mark_alumni_changed
+from alumni_tags import sync_alumni_tags
+import metrics
+
+# Unique Alumni columns checked before insert, in the order duplicates are reported
+UNIQUE_FIELDS = ('email', 'student_id')
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings.
+
+    Answers "definitely not added" or "maybe added"; false positives occur at
+    roughly error_rate once `capacity` items are in, and grow beyond that.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(1, capacity)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, value):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, value):
+        positions = self._positions(value)
+        # Bit updates are read-modify-write, so concurrent adds must not interleave
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, value):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+def _normalize(value):
+    return str(value).strip().lower()
+
+
+class DuplicateIndex:
+    """Per-process Bloom filters over the unique Alumni columns.
+
+    A miss in every filter means the values are new and the insert can go
+    ahead without a lookup; a hit is confirmed against the database. Until
+    the filters are warmed (or when disabled) every check goes to the
+    database. Filters only ever grow: deleted or edited-away values become
+    false positives, which the database check absorbs.
+    """
+
+    def __init__(self):
+        self.filters = None
+        self.ready = False
+        self.capacity = 0
+        self.error_rate = 0.01
+        self._warm_lock = threading.Lock()
+
+    def configure(self, capacity, error_rate):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filters = {field: BloomFilter(capacity, error_rate) for field in UNIQUE_FIELDS}
+        self.ready = False
+
+    def remember(self, **values):
+        """Record values written to the unique columns (email=..., student_id=...)"""
+        if self.filters is None:
+            return
+        for field, value in values.items():
+            if value:
+                self.filters[field].add(_normalize(value))
+
+    def might_exist(self, **values):
+        if not self.ready:
+            return True
+        return any(value and _normalize(value) in self.filters[field] for field, value in values.items())
+
+    def warm(self, batch_size=5000):
+        """Load every stored email and student id; safe to call from a background thread"""
+        if self.filters is None:
+            return
+        with self._warm_lock:
+            if self.ready:
+                return
+            total = 0
+            with db.engine.connect() as connection:
+                # Leave room to grow so the false-positive rate holds as alumni register
+                stored = connection.execute(select(func.count(Alumni.id))).scalar()
+                if stored * 2 > self.capacity:
+                    self.configure(stored * 2, self.error_rate)
+                result = connection.execution_options(stream_results=True).execute(
+                    select(Alumni.email, Alumni.student_id)
+                )
+                for rows in iter(lambda: result.fetchmany(batch_size), []):
+                    for email, student_id in rows:
+                        self.remember(email=email, student_id=student_id)
+                    total += len(rows)
+            self.ready = True
+            print(f"Duplicate filter warmed with {total} alumni")
+
+
+duplicate_index = DuplicateIndex()
+
+
+def find_duplicate(email, student_id):
+    """Return the first of UNIQUE_FIELDS already taken by another alumni, or None.
+
+    Values the filters have never seen are answered without a query.
+    """
+    if not duplicate_index.might_exist(email=email, student_id=student_id):
+        metrics.registry.inc('alumni_duplicate_checks_total', result='filter_miss')
+        return None
+    existing = db.session.execute(
+        select(Alumni.email, Alumni.student_id).where(
+            or_(Alumni.email == email, Alumni.student_id == student_id)
+        )
+    ).all()
+    for field in UNIQUE_FIELDS:
+        value = email if field == 'email' else student_id
+        if any(getattr(row, field) == value for row in existing):
+            metrics.registry.inc('alumni_duplicate_checks_total', result='duplicate')
+            return field
+    metrics.registry.inc('alumni_duplicate_checks_total', result='false_positive')
+    return None
+
+
+def insert_alumni(alumni):
+    """Insert a new (unsaved) Alumni unless its email or student id is taken, and commit.
+
+    Returns (alumni_id, None) on success or (None, field) for a duplicate.
+    Another worker may insert the same values between the check and the
+    insert; ON CONFLICT DO NOTHING turns that race into a zero-row insert
+    instead of a failed transaction.
+    """
+    duplicate = find_duplicate(alumni.email, alumni.student_id)
+    if duplicate:
+        return None, duplicate
+
+    values = {
+        column.name: getattr(alumni, column.name)
+        for column in Alumni.__table__.columns
+        if column.name != 'id' and getattr(alumni, column.name) is not None
+    }
+    try:
+        result = db.session.execute(insert_ignoring_conflicts(db.engine.dialect.name, Alumni.__table__), values)
+    except IntegrityError:
+        # Dialects without ON CONFLICT; anything other than a duplicate is re-raised
+        db.session.rollback()
+        duplicate = find_duplicate(alumni.email, alumni.student_id)
+        if duplicate is None:
+            raise
+        duplicate_index.remember(email=alumni.email, student_id=alumni.student_id)
+        return None, duplicate
+
+    if result.rowcount == 0:
+        # Lost the race to another writer; that unique conflict skipped the row
+        db.session.rollback()
+        duplicate_index.remember(email=alumni.email, student_id=alumni.student_id)
+        return None, find_duplicate(alumni.email, alumni.student_id) or 'email'
+
+    alumni_id = result.inserted_primary_key[0]
+    # Core inserts bypass the ORM flush hooks, so link tags and bump the version here
+    sync_alumni_tags(db.session.connection(), [alumni_id])
+    mark_alumni_changed()
+    db.session.commit()
+    duplicate_index.remember(email=alumni.email, student_id=alumni.student_id)
+    return alumni_id, None
+
+
+@event.listens_for(Session, 'after_flush')
+def _remember_flushed_alumni(session, flush_context):
+    # ORM writes (admin edits, profile updates) keep the filters current;
+    # Core and bulk writers call duplicate_index.remember themselves
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Alumni):
+            duplicate_index.remember(email=obj.email, student_id=obj.student_id)
+
+
+def init_app(app):
+    """Size the filters and warm them from the database in a background thread"""
+    if not app.config.get('DUPLICATE_FILTER_ENABLED', True):
+        return
+    duplicate_index.configure(app.config['DUPLICATE_FILTER_CAPACITY'], app.config['DUPLICATE_FILTER_ERROR_RATE'])
+
+    def warm():
+        with app.app_context():
+            try:
+                duplicate_index.warm()
+            except Exception as e:
+                # Not fatal: this process just confirms every check against the database
+                print(f"Error warming duplicate filter: {e}")
+
+    threading.Thread(target=warm, name='duplicate-filter-warm', daemon=True).start()
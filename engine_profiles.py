@@ -0,0 +1,111 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+# DATABASE_ENGINE_PROFILE values; auto picks sqlite or postgres from the database URL
+PROFILES = ('auto', 'default', 'sqlite', 'postgres', 'pgbouncer')
+
+_SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+def resolve_profile(config):
+    profile = config.get('DATABASE_ENGINE_PROFILE', 'auto')
+    if profile not in PROFILES:
+        raise ValueError(f"DATABASE_ENGINE_PROFILE must be one of {', '.join(PROFILES)}")
+    if profile != 'auto':
+        return profile
+    backend = make_url(config['SQLALCHEMY_DATABASE_URI']).get_backend_name()
+    if backend == 'sqlite':
+        return 'sqlite'
+    if backend == 'postgresql':
+        return 'pgbouncer' if config.get('DATABASE_PGBOUNCER') else 'postgres'
+    return 'default'
+
+
+def engine_options(profile, config):
+    """create_engine() keyword arguments for a profile"""
+    if profile == 'sqlite':
+        if make_url(config['SQLALCHEMY_DATABASE_URI']).database in (None, '', ':memory:'):
+            # Each in-memory connection is its own database; keep Flask-SQLAlchemy's StaticPool
+            return {}
+        # SQLAlchemy 1.4 opens a new connection per checkout for file databases;
+        # pooling runs the pragmas below once per connection instead. The pool
+        # hands a connection to one thread at a time, so it may move between threads.
+        return {
+            'poolclass': QueuePool,
+            'pool_size': config['SQLITE_POOL_SIZE'],
+            'max_overflow': config['SQLITE_POOL_SIZE'],
+            'connect_args': {'check_same_thread': False},
+        }
+    if profile == 'postgres':
+        options = {
+            'pool_size': config['DB_POOL_SIZE'],
+            'max_overflow': config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+            'pool_recycle': config['DB_POOL_RECYCLE'],
+            'pool_pre_ping': True,
+        }
+        if config['DB_STATEMENT_TIMEOUT_MS']:
+            options['connect_args'] = {'options': f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"}
+        return options
+    if profile == 'pgbouncer':
+        # PgBouncer does the pooling; in transaction mode it rejects startup
+        # options and session state does not survive, so the timeout is set
+        # per transaction instead (see _set_local_statement_timeout)
+        return {'poolclass': NullPool}
+    return {}
+
+
+def _sqlite_pragmas(config):
+    synchronous = config['SQLITE_SYNCHRONOUS'].upper()
+    if synchronous not in _SYNCHRONOUS_MODES:
+        raise ValueError(f"SQLITE_SYNCHRONOUS must be one of {', '.join(_SYNCHRONOUS_MODES)}")
+    return [
+        'PRAGMA journal_mode=WAL',
+        f'PRAGMA synchronous={synchronous}',
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size=-{int(config['SQLITE_CACHE_SIZE_KB'])}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+    ]
+
+
+def _run_on_connect(engine, statements):
+    @event.listens_for(engine, 'connect')
+    def apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def _set_local_statement_timeout(engine, timeout_ms):
+    @event.listens_for(engine, 'begin')
+    def apply(connection):
+        # Straight on the DBAPI cursor, so it is not counted as a query by metrics or budgets
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(f'SET LOCAL statement_timeout = {int(timeout_ms)}')
+        finally:
+            cursor.close()
+
+
+def init_app(app, db):
+    """Apply the engine profile; call after db.init_app and before the engine is first used.
+
+    Options set explicitly in SQLALCHEMY_ENGINE_OPTIONS win over the profile's.
+    """
+    profile = resolve_profile(app.config)
+    options = engine_options(profile, app.config)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    app.extensions['engine_profile'] = profile
+
+    engine = db.get_engine(app)
+    if profile == 'sqlite':
+        _run_on_connect(engine, _sqlite_pragmas(app.config))
+    elif profile == 'pgbouncer' and app.config['DB_STATEMENT_TIMEOUT_MS']:
+        _set_local_statement_timeout(engine, app.config['DB_STATEMENT_TIMEOUT_MS'])
+    return profile
@@ -1,10 +1,54 @@
-from firebase_admin import auth, firestore, storage
-from firebase_config import get_firestore_client, get_storage_client, get_pyrebase_app
-import requests
+from firebase_config import LazyModule, auth, firestore, get_firestore_client, get_storage_client, get_pyrebase_app
+from token_cache import VerifiedTokenCache
+from metrics import track_firebase_call
+from firestore_search import TOKENS_FIELD, SEARCH_FIELDS, build_search_tokens, query_gram, matches
+from werkzeug.local import LocalProxy
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Optional, Iterable
+
+# Only the resumable upload calls need requests; keep it off the import path
+requests = LazyModule('requests')
+
+# Firestore rejects WriteBatches with more than 500 writes
+BATCH_LIMIT = 500
+
+# Counter document maintained alongside the alumni collection
+STATS_COLLECTION = 'stats'
+ALUMNI_COUNTER_DOCUMENT = 'alumni'
+
+# Resumable upload chunks must be a multiple of 256 KiB (except the last one)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Verified ID token cache sizing
+TOKEN_CACHE_SIZE = int(os.getenv('FIREBASE_TOKEN_CACHE_SIZE', '10000'))
+TOKEN_REVOCATION_TTL = int(os.getenv('FIREBASE_TOKEN_REVOCATION_TTL', '60'))
+
+# Candidate documents fetched per page of an indexed search query
+SEARCH_CANDIDATE_LIMIT = 500
+
+# Seconds a computed stats result is served from memory
+STATS_CACHE_TTL = 30
+
+# Where the SQL -> Firestore incremental sync keeps its watermark
+SYNC_STATE_COLLECTION = 'sync_state'
+SYNC_STATE_DOCUMENT = 'sql_to_firestore'
+
+def _read_exactly(stream, length: int) -> bytes:
+    """Read length bytes from stream, or fewer if it ends first"""
+    parts = []
+    remaining = length
+    while remaining > 0:
+        part = stream.read(remaining)
+        if not part:
+            break
+        parts.append(part)
+        remaining -= len(part)
+    return b''.join(parts)
 
 class FirebaseAPI:
     """Firebase API wrapper for alumni management system"""
@@ -13,8 +57,17 @@ class FirebaseAPI:
         self.db = get_firestore_client()
         self.storage_bucket = get_storage_client()
         self.pyrebase_app = get_pyrebase_app()
+        self._email_doc_ids = None
+        self._email_map_lock = threading.Lock()
+        self._stats_cache = None
+        self._stats_cache_expires = 0
+        self._stats_lock = threading.Lock()
+        self._counter_ready = False
+        self._counter_lock = threading.Lock()
+        self.token_cache = VerifiedTokenCache(max_size=TOKEN_CACHE_SIZE, revocation_ttl=TOKEN_REVOCATION_TTL)
         
     # Authentication Methods
+    @track_firebase_call('auth')
     def create_user(self, email: str, password: str, display_name: str = None) -> Dict:
         """Create a new Firebase user"""
         try:
@@ -41,10 +94,20 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
-    def verify_token(self, id_token: str) -> Dict:
-        """Verify Firebase ID token"""
+    @track_firebase_call('auth')
+    def verify_token(self, id_token: str, check_revoked: bool = False) -> Dict:
+        """Verify Firebase ID token
+        
+        Successful verifications are cached until the token's exp claim, so
+        repeat calls with the same token skip signature checks. The Admin
+        SDK itself caches Google's public keys per their Cache-Control
+        max-age, so key fetches only happen on cache misses.
+        """
         try:
-            decoded_token = auth.verify_id_token(id_token)
+            decoded_token = self.token_cache.get(id_token, check_revoked=check_revoked)
+            if decoded_token is None:
+                decoded_token = auth.verify_id_token(id_token, check_revoked=check_revoked)
+                self.token_cache.put(id_token, decoded_token, check_revoked=check_revoked)
             return {
                 'success': True,
                 'uid': decoded_token['uid'],
@@ -57,6 +120,7 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
+    @track_firebase_call('auth')
     def get_user(self, uid: str) -> Dict:
         """Get user information by UID"""
         try:
@@ -75,10 +139,13 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
+    @track_firebase_call('auth')
     def update_user(self, uid: str, **kwargs) -> Dict:
         """Update user information"""
         try:
             user = auth.update_user(uid, **kwargs)
+            if 'disabled' in kwargs or 'password' in kwargs:
+                self.token_cache.invalidate_uid(uid)
             return {
                 'success': True,
                 'user_id': user.uid,
@@ -90,10 +157,12 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
+    @track_firebase_call('auth')
     def delete_user(self, uid: str) -> Dict:
         """Delete a user"""
         try:
             auth.delete_user(uid)
+            self.token_cache.invalidate_uid(uid)
             return {
                 'success': True,
                 'message': 'User deleted successfully'
@@ -104,7 +173,31 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
+    @track_firebase_call('auth')
+    def revoke_user_tokens(self, uid: str) -> Dict:
+        """Revoke a user's refresh tokens and drop their cached ID tokens"""
+        try:
+            auth.revoke_refresh_tokens(uid)
+            self.token_cache.invalidate_uid(uid)
+            return {
+                'success': True,
+                'message': 'User tokens revoked successfully'
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def get_token_cache_stats(self) -> Dict:
+        """Get hit/miss counters for the verified token cache"""
+        return {
+            'success': True,
+            'token_cache': self.token_cache.stats()
+        }
+    
     # Firestore Database Methods
+    @track_firebase_call('firestore')
     def add_alumni_to_firestore(self, alumni_data: Dict) -> Dict:
         """Add alumni data to Firestore"""
         try:
@@ -120,11 +213,24 @@ class FirebaseAPI:
                 if hasattr(alumni_data['date_of_birth'], 'strftime'):
                     alumni_data['date_of_birth'] = alumni_data['date_of_birth'].strftime('%Y-%m-%d')
             
-            doc_ref = self.db.collection('alumni').add(alumni_data)
+            alumni_data[TOKENS_FIELD] = build_search_tokens(alumni_data)
+            
+            # Create the document and bump the counter in one atomic batch
+            self._ensure_counter()
+            doc_ref = self.db.collection('alumni').document()
+            batch = self.db.batch()
+            batch.set(doc_ref, alumni_data)
+            batch.set(self._counter_ref(), {'count': firestore.Increment(1)}, merge=True)
+            batch.commit()
+            self.invalidate_stats_cache()
+            
+            with self._email_map_lock:
+                if self._email_doc_ids is not None and alumni_data.get('email'):
+                    self._email_doc_ids[alumni_data['email']] = doc_ref.id
             
             return {
                 'success': True,
-                'document_id': doc_ref[1].id,
+                'document_id': doc_ref.id,
                 'message': 'Alumni added to Firestore successfully'
             }
         except Exception as e:
@@ -133,6 +239,7 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
+    @track_firebase_call('firestore')
     def get_alumni_from_firestore(self, alumni_id: str = None) -> Dict:
         """Get alumni data from Firestore"""
         try:
@@ -143,9 +250,11 @@ class FirebaseAPI:
                 # Get specific alumni
                 doc = self.db.collection('alumni').document(alumni_id).get()
                 if doc.exists:
+                    alumni_data = doc.to_dict()
+                    alumni_data.pop(TOKENS_FIELD, None)
                     return {
                         'success': True,
-                        'data': doc.to_dict(),
+                        'data': alumni_data,
                         'id': doc.id
                     }
                 else:
@@ -159,6 +268,7 @@ class FirebaseAPI:
                 alumni_list = []
                 for doc in docs:
                     alumni_data = doc.to_dict()
+                    alumni_data.pop(TOKENS_FIELD, None)
                     alumni_data['id'] = doc.id
                     alumni_list.append(alumni_data)
                 
@@ -173,6 +283,25 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
+    @track_firebase_call('firestore')
+    def stream_alumni_from_firestore(self, page_size: int = 1000):
+        """Yield every alumni document in pages, without holding the whole collection"""
+        if not self.db:
+            raise RuntimeError('Firestore client not available')
+        
+        collection = self.db.collection('alumni')
+        query = collection.order_by('__name__').limit(page_size)
+        while True:
+            docs = list(query.stream())
+            for doc in docs:
+                alumni_data = doc.to_dict()
+                alumni_data['id'] = doc.id
+                yield alumni_data
+            if len(docs) < page_size:
+                break
+            query = collection.order_by('__name__').start_after(docs[-1]).limit(page_size)
+    
+    @track_firebase_call('firestore')
     def update_alumni_in_firestore(self, alumni_id: str, update_data: Dict) -> Dict:
         """Update alumni data in Firestore"""
         try:
@@ -187,7 +316,15 @@ class FirebaseAPI:
                 if hasattr(update_data['date_of_birth'], 'strftime'):
                     update_data['date_of_birth'] = update_data['date_of_birth'].strftime('%Y-%m-%d')
             
-            self.db.collection('alumni').document(alumni_id).update(update_data)
+            doc_ref = self.db.collection('alumni').document(alumni_id)
+            if any(field in update_data for field in SEARCH_FIELDS):
+                # Rebuild the search tokens from the merged document
+                current = doc_ref.get()
+                merged = dict(current.to_dict() or {}) if current.exists else {}
+                merged.update(update_data)
+                update_data[TOKENS_FIELD] = build_search_tokens(merged)
+            
+            doc_ref.update(update_data)
             
             return {
                 'success': True,
@@ -199,13 +336,31 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
+    @track_firebase_call('firestore')
     def delete_alumni_from_firestore(self, alumni_id: str) -> Dict:
         """Delete alumni data from Firestore"""
         try:
             if not self.db:
                 return {'success': False, 'error': 'Firestore client not available'}
             
-            self.db.collection('alumni').document(alumni_id).delete()
+            doc_ref = self.db.collection('alumni').document(alumni_id)
+            counter_ref = self._counter_ref()
+            self._ensure_counter()
+            
+            @firestore.transactional
+            def delete_and_decrement(transaction):
+                # Only decrement when the document actually existed
+                snapshot = doc_ref.get(transaction=transaction)
+                if snapshot.exists:
+                    transaction.delete(doc_ref)
+                    transaction.set(counter_ref, {'count': firestore.Increment(-1)}, merge=True)
+            
+            delete_and_decrement(self.db.transaction())
+            self.invalidate_stats_cache()
+            
+            # The cached email -> id map may point at the deleted document
+            with self._email_map_lock:
+                self._email_doc_ids = None
             
             return {
                 'success': True,
@@ -217,21 +372,45 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
-    def search_alumni_in_firestore(self, query: str, field: str = 'first_name') -> Dict:
-        """Search alumni in Firestore"""
+    @track_firebase_call('firestore')
+    def search_alumni_in_firestore(self, query: str, field: str = None, limit: int = 50) -> Dict:
+        """Search alumni in Firestore
+        
+        Case-insensitive substring search across SEARCH_FIELDS (or a single
+        field) using the search_tokens array kept on every document. An
+        array_contains query on the query's most selective gram narrows the
+        candidates, paged in document id order until `limit` matches are
+        found or the candidates run out, and each query term is checked
+        against the candidate's text. Terms of one or two characters are
+        only indexed as word prefixes, so a query made only of such terms
+        matches words starting with them rather than anywhere inside.
+        """
         try:
             if not self.db:
                 return {'success': False, 'error': 'Firestore client not available'}
             
-            # Firestore doesn't support full-text search, so we'll do a simple contains query
-            # For production, consider using Algolia or similar search service
-            docs = self.db.collection('alumni').where(field, '>=', query).where(field, '<=', query + '\uf8ff').stream()
+            gram, terms = query_gram(query)
+            if not gram:
+                return {'success': True, 'data': [], 'count': 0}
+            fields = [field] if field else SEARCH_FIELDS
             
+            candidates = self.db.collection('alumni').where(TOKENS_FIELD, 'array_contains', gram).order_by('__name__')
+            query_page = candidates.limit(SEARCH_CANDIDATE_LIMIT)
             alumni_list = []
-            for doc in docs:
-                alumni_data = doc.to_dict()
-                alumni_data['id'] = doc.id
-                alumni_list.append(alumni_data)
+            while len(alumni_list) < limit:
+                docs = list(query_page.stream())
+                for doc in docs:
+                    alumni_data = doc.to_dict()
+                    if not matches(alumni_data, terms, fields):
+                        continue
+                    alumni_data.pop(TOKENS_FIELD, None)
+                    alumni_data['id'] = doc.id
+                    alumni_list.append(alumni_data)
+                    if len(alumni_list) >= limit:
+                        break
+                if len(docs) < SEARCH_CANDIDATE_LIMIT:
+                    break
+                query_page = candidates.start_after(docs[-1]).limit(SEARCH_CANDIDATE_LIMIT)
             
             return {
                 'success': True,
@@ -244,7 +423,42 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
+    @track_firebase_call('firestore')
+    def reindex_search_tokens(self, page_size: int = 400) -> Dict:
+        """Backfill search_tokens on every alumni document"""
+        try:
+            if not self.db:
+                return {'success': False, 'error': 'Firestore client not available'}
+            
+            collection = self.db.collection('alumni')
+            updated_count = 0
+            batch = self.db.batch()
+            batch_size = 0
+            for alumni_data in self.stream_alumni_from_firestore(page_size=page_size):
+                batch.update(collection.document(alumni_data['id']), {TOKENS_FIELD: build_search_tokens(alumni_data)})
+                batch_size += 1
+                if batch_size >= BATCH_LIMIT:
+                    batch.commit()
+                    updated_count += batch_size
+                    batch = self.db.batch()
+                    batch_size = 0
+            if batch_size:
+                batch.commit()
+                updated_count += batch_size
+            
+            return {
+                'success': True,
+                'message': f'Reindexed {updated_count} alumni documents',
+                'updated_count': updated_count
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     # Firebase Storage Methods
+    @track_firebase_call('storage')
     def upload_file_to_storage(self, file_path: str, destination_path: str) -> Dict:
         """Upload file to Firebase Storage"""
         try:
@@ -268,6 +482,7 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
+    @track_firebase_call('storage')
     def upload_bytes_to_storage(self, file_bytes: bytes, destination_path: str, content_type: str = None) -> Dict:
         """Upload file bytes to Firebase Storage"""
         try:
@@ -291,6 +506,136 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
+    @track_firebase_call('storage')
+    def upload_stream_to_storage(self, stream, destination_path: str, content_type: str = None,
+                                 size: int = None) -> Dict:
+        """Upload a file-like stream to Firebase Storage without staging it on disk
+        
+        Setting a chunk size makes the client library send the stream as a
+        resumable upload in UPLOAD_CHUNK_SIZE pieces, so only one chunk is
+        held in memory at a time.
+        """
+        try:
+            if not self.storage_bucket:
+                return {'success': False, 'error': 'Storage client not available'}
+            
+            blob = self.storage_bucket.blob(destination_path, chunk_size=UPLOAD_CHUNK_SIZE)
+            blob.upload_from_file(stream, content_type=content_type, size=size)
+            
+            # Make the blob publicly readable
+            blob.make_public()
+            
+            return {
+                'success': True,
+                'download_url': blob.public_url,
+                'message': 'File uploaded successfully'
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    @track_firebase_call('storage')
+    def create_resumable_upload(self, destination_path: str, content_type: str = None,
+                                size: int = None) -> Dict:
+        """Open a resumable upload session that chunks can be sent to later"""
+        try:
+            if not self.storage_bucket:
+                return {'success': False, 'error': 'Storage client not available'}
+            
+            blob = self.storage_bucket.blob(destination_path)
+            session_url = blob.create_resumable_upload_session(content_type=content_type, size=size)
+            
+            return {
+                'success': True,
+                'session_url': session_url,
+                'chunk_size': UPLOAD_CHUNK_SIZE
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def _resumable_result(self, response, destination_path: str) -> Dict:
+        """Interpret a resumable-session response from Cloud Storage"""
+        if response.status_code in (200, 201):
+            blob = self.storage_bucket.blob(destination_path)
+            blob.make_public()
+            return {
+                'success': True,
+                'complete': True,
+                'download_url': blob.public_url,
+                'message': 'File uploaded successfully'
+            }
+        if response.status_code == 308:
+            # Range: bytes=0-N lists what has been persisted so far
+            persisted = response.headers.get('Range')
+            next_offset = int(persisted.rsplit('-', 1)[1]) + 1 if persisted else 0
+            return {
+                'success': True,
+                'complete': False,
+                'next_offset': next_offset
+            }
+        return {
+            'success': False,
+            'error': f'Storage responded with {response.status_code}: {response.text}'
+        }
+    
+    @track_firebase_call('storage')
+    def upload_resumable_chunk(self, session_url: str, destination_path: str, stream, start: int,
+                               length: int, total_size: int = None) -> Dict:
+        """Forward one chunk of a resumable upload to Cloud Storage.
+
+        The chunk is read into memory first (at most UPLOAD_CHUNK_SIZE bytes):
+        requests cannot size a bare stream, so it would send it with
+        Transfer-Encoding: chunked, which the session does not accept.
+        """
+        try:
+            if not self.storage_bucket:
+                return {'success': False, 'error': 'Storage client not available'}
+            if length > UPLOAD_CHUNK_SIZE:
+                return {'success': False, 'error': f'Chunks may be at most {UPLOAD_CHUNK_SIZE} bytes'}
+            
+            body = _read_exactly(stream, length)
+            if len(body) != length:
+                return {'success': False, 'error': 'Request body ended before the end of the chunk'}
+            
+            end = start + length - 1
+            total = str(total_size) if total_size is not None else '*'
+            response = requests.put(session_url, data=body, headers={
+                'Content-Length': str(length),
+                'Content-Range': f'bytes {start}-{end}/{total}'
+            }, timeout=300)
+            return self._resumable_result(response, destination_path)
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    @track_firebase_call('storage')
+    def get_resumable_upload_status(self, session_url: str, destination_path: str,
+                                    total_size: int = None) -> Dict:
+        """Ask Cloud Storage how much of a resumable upload it has persisted"""
+        try:
+            if not self.storage_bucket:
+                return {'success': False, 'error': 'Storage client not available'}
+            
+            total = str(total_size) if total_size is not None else '*'
+            response = requests.put(session_url, data=b'', headers={
+                'Content-Length': '0',
+                'Content-Range': f'bytes */{total}'
+            }, timeout=60)
+            return self._resumable_result(response, destination_path)
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    @track_firebase_call('storage')
     def delete_file_from_storage(self, file_path: str) -> Dict:
         """Delete file from Firebase Storage"""
         try:
@@ -310,6 +655,7 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
+    @track_firebase_call('storage')
     def get_file_url(self, file_path: str) -> Dict:
         """Get public URL for a file in Firebase Storage"""
         try:
@@ -330,37 +676,120 @@ class FirebaseAPI:
             }
     
     # Sync Methods
-    def sync_alumni_to_firestore(self, alumni_list: List[Dict]) -> Dict:
-        """Sync alumni data from SQL database to Firestore"""
+    @track_firebase_call('firestore')
+    def get_email_doc_id_map(self, refresh: bool = False) -> Dict[str, str]:
+        """Return a cached email -> document id map for the alumni collection"""
+        with self._email_map_lock:
+            if self._email_doc_ids is None or refresh:
+                # Projection query: only the email field is read back
+                docs = self.db.collection('alumni').select(['email']).stream()
+                email_doc_ids = {}
+                for doc in docs:
+                    email = (doc.to_dict() or {}).get('email')
+                    if email:
+                        email_doc_ids[email] = doc.id
+                self._email_doc_ids = email_doc_ids
+            return self._email_doc_ids
+    
+    @track_firebase_call('firestore')
+    def get_sync_watermark(self) -> Optional[datetime]:
+        """Return the updated_at watermark of the last successful SQL -> Firestore sync"""
+        doc = self.db.collection(SYNC_STATE_COLLECTION).document(SYNC_STATE_DOCUMENT).get()
+        if doc.exists:
+            watermark = (doc.to_dict() or {}).get('watermark')
+            if watermark:
+                return datetime.fromisoformat(watermark)
+        return None
+    
+    @track_firebase_call('firestore')
+    def set_sync_watermark(self, watermark: datetime) -> None:
+        """Record the updated_at watermark after a fully successful sync"""
+        self.db.collection(SYNC_STATE_COLLECTION).document(SYNC_STATE_DOCUMENT).set({
+            'watermark': watermark.isoformat(),
+            'synced_at': firestore.SERVER_TIMESTAMP
+        })
+    
+    @track_firebase_call('firestore')
+    def sync_alumni_to_firestore(self, alumni_list: Iterable[Dict], max_workers: int = 4,
+                                 refresh_ids: bool = False) -> Dict:
+        """Sync alumni data from SQL database to Firestore
+        
+        Records are streamed into WriteBatches of at most BATCH_LIMIT writes
+        (counter update included), and up to max_workers batches are committed
+        concurrently. Existing documents are found through the cached
+        email -> document id map.
+        """
         try:
             if not self.db:
                 return {'success': False, 'error': 'Firestore client not available'}
             
-            batch = self.db.batch()
+            email_doc_ids = self.get_email_doc_id_map(refresh=refresh_ids)
+            self._ensure_counter()
+            collection = self.db.collection('alumni')
             success_count = 0
             error_count = 0
-            
-            for alumni in alumni_list:
-                try:
-                    # Check if alumni already exists
-                    existing_docs = self.db.collection('alumni').where('email', '==', alumni['email']).limit(1).stream()
-                    
-                    if list(existing_docs):
-                        # Update existing
-                        doc_ref = self.db.collection('alumni').document()
-                        batch.set(doc_ref, alumni, merge=True)
-                    else:
-                        # Add new
-                        doc_ref = self.db.collection('alumni').document()
-                        batch.set(doc_ref, alumni)
+            created = {}
+            in_flight = {}
+            
+            def collect(done):
+                nonlocal success_count, error_count
+                for future in done:
+                    size, new_ids = in_flight.pop(future)
+                    try:
+                        future.result()
+                        success_count += size
+                        created.update(new_ids)
+                    except Exception as e:
+                        error_count += size
+                        print(f"Error committing Firestore batch of {size}: {e}")
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                def submit(batch, size, new_ids):
+                    if new_ids:
+                        # New documents bump the counter in the same atomic batch
+                        batch.set(self._counter_ref(), {'count': firestore.Increment(len(new_ids))}, merge=True)
+                    if len(in_flight) >= max_workers:
+                        # Bound the number of outstanding commits
+                        done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                        collect(done)
+                    in_flight[executor.submit(batch.commit)] = (size, new_ids)
+                
+                batch = self.db.batch()
+                batch_size = 0
+                new_ids = {}
+                for alumni in alumni_list:
+                    try:
+                        email = alumni['email']
+                        alumni = dict(alumni, **{TOKENS_FIELD: build_search_tokens(alumni)})
+                        doc_id = email_doc_ids.get(email) or created.get(email) or new_ids.get(email)
+                        if doc_id:
+                            # Update existing
+                            batch.set(collection.document(doc_id), alumni, merge=True)
+                        else:
+                            # Add new
+                            doc_ref = collection.document()
+                            batch.set(doc_ref, alumni)
+                            new_ids[email] = doc_ref.id
+                        batch_size += 1
+                    except Exception as e:
+                        error_count += 1
+                        print(f"Error processing alumni {alumni.get('email', 'unknown')}: {e}")
+                        continue
                     
-                    success_count += 1
-                except Exception as e:
-                    error_count += 1
-                    print(f"Error processing alumni {alumni.get('email', 'unknown')}: {e}")
+                    # Leave room for the counter write
+                    if batch_size >= BATCH_LIMIT - 1:
+                        submit(batch, batch_size, new_ids)
+                        batch = self.db.batch()
+                        batch_size = 0
+                        new_ids = {}
+                
+                if batch_size:
+                    submit(batch, batch_size, new_ids)
+                collect(wait(list(in_flight)).done)
             
-            # Commit the batch
-            batch.commit()
+            self.invalidate_stats_cache()
+            with self._email_map_lock:
+                email_doc_ids.update(created)
             
             return {
                 'success': True,
@@ -374,15 +803,79 @@ class FirebaseAPI:
                 'error': str(e)
             }
     
-    def get_firestore_stats(self) -> Dict:
+    def _counter_ref(self):
+        return self.db.collection(STATS_COLLECTION).document(ALUMNI_COUNTER_DOCUMENT)
+    
+    def _ensure_counter(self) -> None:
+        """Seed the counter document from a real count before the first increment.
+
+        Deployments that predate the counter have alumni documents but no
+        counter; incrementing a missing document would start it at the
+        increment and get_firestore_stats would trust that from then on.
+        """
+        if self._counter_ready:
+            return
+        with self._counter_lock:
+            if self._counter_ready:
+                return
+            counter_ref = self._counter_ref()
+            if not counter_ref.get().exists:
+                total_count = self._count_alumni_documents()
+                
+                @firestore.transactional
+                def seed(transaction):
+                    # Another worker may have seeded it meanwhile; its count stands
+                    if not counter_ref.get(transaction=transaction).exists:
+                        transaction.set(counter_ref, {'count': total_count, 'recounted_at': firestore.SERVER_TIMESTAMP})
+                
+                seed(self.db.transaction())
+            self._counter_ready = True
+    
+    def invalidate_stats_cache(self) -> None:
+        """Drop the in-process stats cache after a local write"""
+        with self._stats_lock:
+            self._stats_cache = None
+            self._stats_cache_expires = 0
+    
+    @track_firebase_call('firestore')
+    def count_alumni_in_firestore(self) -> int:
+        """Count alumni documents with an aggregation query and reset the counter document"""
+        total_count = self._count_alumni_documents()
+        self._counter_ref().set({'count': total_count, 'recounted_at': firestore.SERVER_TIMESTAMP}, merge=True)
+        self._counter_ready = True
+        return total_count
+    
+    def _count_alumni_documents(self) -> int:
+        collection = self.db.collection('alumni')
+        if hasattr(collection, 'count'):
+            # Billed as one read per 1000 index entries instead of one per document
+            result = collection.count(alias='total').get()
+            total_count = int(result[0][0].value)
+        else:
+            # Older client libraries: a keys-only projection still avoids fetching field data
+            total_count = sum(1 for _ in collection.select([]).stream())
+        return total_count
+    
+    @track_firebase_call('firestore')
+    def get_firestore_stats(self, use_cache: bool = True, recount: bool = False) -> Dict:
         """Get statistics from Firestore"""
         try:
             if not self.db:
                 return {'success': False, 'error': 'Firestore client not available'}
             
-            # Get total count
-            total_docs = self.db.collection('alumni').stream()
-            total_count = sum(1 for _ in total_docs)
+            if use_cache and not recount:
+                with self._stats_lock:
+                    if self._stats_cache is not None and time.monotonic() < self._stats_cache_expires:
+                        return self._stats_cache
+            
+            # Get total count from the maintained counter document (one read)
+            total_count = None
+            if not recount:
+                counter = self._counter_ref().get()
+                if counter.exists:
+                    total_count = (counter.to_dict() or {}).get('count')
+            if total_count is None:
+                total_count = self.count_alumni_in_firestore()
             
             # Get recent documents
             recent_docs = self.db.collection('alumni').order_by('created_at', direction=firestore.Query.DESCENDING).limit(5).stream()
@@ -392,16 +885,33 @@ class FirebaseAPI:
                 alumni_data['id'] = doc.id
                 recent_alumni.append(alumni_data)
             
-            return {
+            result = {
                 'success': True,
                 'total_count': total_count,
                 'recent_alumni': recent_alumni
             }
+            with self._stats_lock:
+                self._stats_cache = result
+                self._stats_cache_expires = time.monotonic() + STATS_CACHE_TTL
+            return result
         except Exception as e:
             return {
                 'success': False,
                 'error': str(e)
             }
 
-# Create global instance
-firebase_api = FirebaseAPI()
+# Process-wide instance, created on first use rather than at import time
+_firebase_api = None
+_firebase_api_lock = threading.Lock()
+
+def get_firebase_api() -> FirebaseAPI:
+    """Return the shared FirebaseAPI, initializing the Firebase SDKs on first call"""
+    global _firebase_api
+    if _firebase_api is None:
+        with _firebase_api_lock:
+            if _firebase_api is None:
+                _firebase_api = FirebaseAPI()
+    return _firebase_api
+
+# Drop-in stand-in for the old global instance; resolves through get_firebase_api()
+firebase_api = LocalProxy(get_firebase_api)
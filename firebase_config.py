@@ -1,14 +1,52 @@
-import firebase_admin
-from firebase_admin import credentials, auth, firestore, storage
-import pyrebase
+import importlib
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
 
+class LazyModule:
+    """Module stand-in that imports the real module on first attribute access"""
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+    
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+# The Firebase SDKs are heavy to import, so nothing is loaded until first use
+firebase_admin = LazyModule('firebase_admin')
+credentials = LazyModule('firebase_admin.credentials')
+auth = LazyModule('firebase_admin.auth')
+firestore = LazyModule('firebase_admin.firestore')
+storage = LazyModule('firebase_admin.storage')
+pyrebase = LazyModule('pyrebase')
+
+_init_lock = threading.Lock()
+_initialized = False
+
 # Firebase Admin SDK Configuration
 def initialize_firebase_admin():
     """Initialize Firebase Admin SDK for server-side operations"""
+    global _initialized
+    if _initialized:
+        return True
+    with _init_lock:
+        if _initialized:
+            return True
+        _initialized = _initialize_firebase_admin()
+        return _initialized
+
+def _initialize_firebase_admin():
     try:
         # Check if Firebase app is already initialized
         if not firebase_admin._apps:
@@ -56,6 +94,7 @@ def get_pyrebase_config():
 def get_firestore_client():
     """Get Firestore client instance"""
     try:
+        initialize_firebase_admin()
         return firestore.client()
     except Exception as e:
         print(f"Error getting Firestore client: {e}")
@@ -64,6 +103,7 @@ def get_firestore_client():
 def get_storage_client():
     """Get Firebase Storage client instance"""
     try:
+        initialize_firebase_admin()
         return storage.bucket()
     except Exception as e:
         print(f"Error getting Storage client: {e}")
@@ -77,6 +117,3 @@ def get_pyrebase_app():
     except Exception as e:
         print(f"Error initializing Pyrebase: {e}")
         return None
-
-# Initialize Firebase when module is imported
-initialize_firebase_admin()
@@ -1,8 +1,17 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from firebase_api import firebase_api
 from models import Alumni, db
+from alumni_ingest import upsert_alumni_by_email, iter_upsert_alumni_by_email
+from query_budget import query_budget
 from datetime import datetime
-import os
+from itsdangerous import URLSafeSerializer, BadSignature
+import json
+import re
+
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+
+# Cloud Storage requires non-final resumable chunks to be 256 KiB aligned
+RESUMABLE_CHUNK_ALIGNMENT = 256 * 1024
 
 # Create Blueprint for Firebase routes
 firebase_bp = Blueprint('firebase', __name__, url_prefix='/api/firebase')
@@ -40,7 +49,7 @@ def firebase_verify_token():
         if not id_token:
             return jsonify({'success': False, 'error': 'ID token is required'}), 400
         
-        result = firebase_api.verify_token(id_token)
+        result = firebase_api.verify_token(id_token, check_revoked=bool(data.get('check_revoked', False)))
         
         if result['success']:
             return jsonify(result), 200
@@ -93,6 +102,28 @@ def firebase_delete_user(uid):
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@firebase_bp.route('/auth/user/<uid>/revoke', methods=['POST'])
+def firebase_revoke_user_tokens(uid):
+    """Revoke a user's refresh tokens"""
+    try:
+        result = firebase_api.revoke_user_tokens(uid)
+        
+        if result['success']:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 400
+            
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@firebase_bp.route('/auth/token-cache', methods=['GET'])
+def firebase_token_cache_stats():
+    """Get verified token cache hit/miss counters"""
+    try:
+        return jsonify(firebase_api.get_token_cache_stats()), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 # Firestore Database Routes
 @firebase_bp.route('/firestore/alumni', methods=['POST'])
 def firebase_add_alumni():
@@ -165,12 +196,30 @@ def firebase_search_alumni():
     """Search alumni in Firestore"""
     try:
         query = request.args.get('q')
-        field = request.args.get('field', 'first_name')
+        field = request.args.get('field')
+        try:
+            limit = max(1, min(int(request.args.get('limit', 50)), 200))
+        except ValueError:
+            limit = 50
         
         if not query:
             return jsonify({'success': False, 'error': 'Search query is required'}), 400
         
-        result = firebase_api.search_alumni_in_firestore(query, field)
+        result = firebase_api.search_alumni_in_firestore(query, field, limit=limit)
+        
+        if result['success']:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 400
+            
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@firebase_bp.route('/firestore/alumni/reindex', methods=['POST'])
+def firebase_reindex_alumni():
+    """Backfill the search tokens on every alumni document"""
+    try:
+        result = firebase_api.reindex_search_tokens()
         
         if result['success']:
             return jsonify(result), 200
@@ -194,21 +243,133 @@ def firebase_upload_file():
         if file.filename == '':
             return jsonify({'success': False, 'error': 'No file selected'}), 400
         
-        # Save file temporarily
-        temp_path = f'temp_{file.filename}'
-        file.save(temp_path)
+        # Hand the upload stream to Storage directly instead of via a temp file
+        result = firebase_api.upload_stream_to_storage(file.stream, destination_path, file.mimetype)
+        
+        if result['success']:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 400
+            
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@firebase_bp.route('/storage/stream/<path:destination_path>', methods=['PUT'])
+def firebase_stream_upload(destination_path):
+    """Stream a raw request body to Firebase Storage"""
+    try:
+        if not request.content_length:
+            return jsonify({'success': False, 'error': 'Content-Length is required'}), 411
+        
+        result = firebase_api.upload_stream_to_storage(
+            request.stream,
+            destination_path,
+            request.content_type or 'application/octet-stream',
+            size=request.content_length
+        )
+        
+        if result['success']:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 400
+            
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def _upload_serializer():
+    return URLSafeSerializer(current_app.secret_key, salt='firebase-resumable-upload')
+
+def _parse_content_range(header):
+    """Parse 'bytes start-end/total' (total may be '*') into integers"""
+    match = CONTENT_RANGE_RE.match(header or '')
+    if not match:
+        return None
+    start, end, total = match.groups()
+    return int(start), int(end), None if total == '*' else int(total)
+
+@firebase_bp.route('/storage/uploads', methods=['POST'])
+def firebase_create_upload():
+    """Start a resumable, chunked upload to Firebase Storage"""
+    try:
+        data = request.get_json()
+        destination_path = data.get('destination_path')
+        content_type = data.get('content_type', 'application/octet-stream')
+        size = data.get('size')
+        
+        if not destination_path:
+            return jsonify({'success': False, 'error': 'Destination path is required'}), 400
+        
+        result = firebase_api.create_resumable_upload(destination_path, content_type, size)
         
+        if not result['success']:
+            return jsonify(result), 400
+        
+        # The upload id carries the session itself, so any worker can take the next chunk
+        upload_id = _upload_serializer().dumps({
+            'session_url': result['session_url'],
+            'destination_path': destination_path,
+            'size': size
+        })
+        return jsonify({
+            'success': True,
+            'upload_id': upload_id,
+            'chunk_size': result['chunk_size'],
+            'next_offset': 0
+        }), 201
+            
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@firebase_bp.route('/storage/uploads/<upload_id>', methods=['PUT'])
+def firebase_upload_chunk(upload_id):
+    """Upload one chunk of a resumable upload (Content-Range: bytes start-end/total)"""
+    try:
         try:
-            result = firebase_api.upload_file_to_storage(temp_path, destination_path)
+            upload = _upload_serializer().loads(upload_id)
+        except BadSignature:
+            return jsonify({'success': False, 'error': 'Unknown upload'}), 404
+        
+        content_range = _parse_content_range(request.headers.get('Content-Range'))
+        if content_range is None:
+            return jsonify({'success': False, 'error': 'Content-Range: bytes start-end/total is required'}), 400
+        start, end, total = content_range
+        length = end - start + 1
+        if request.content_length != length:
+            return jsonify({'success': False, 'error': 'Content-Length does not match Content-Range'}), 400
+        is_last = total is not None and end + 1 == total
+        if not is_last and length % RESUMABLE_CHUNK_ALIGNMENT:
+            return jsonify({'success': False, 'error': 'Chunks other than the last must be a multiple of 256 KiB'}), 400
+        
+        result = firebase_api.upload_resumable_chunk(
+            upload['session_url'], upload['destination_path'], request.stream, start, length,
+            total if total is not None else upload.get('size')
+        )
+        
+        if result['success']:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 400
             
-            if result['success']:
-                return jsonify(result), 200
-            else:
-                return jsonify(result), 400
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@firebase_bp.route('/storage/uploads/<upload_id>', methods=['GET'])
+def firebase_upload_status(upload_id):
+    """Get the offset to resume a chunked upload from"""
+    try:
+        try:
+            upload = _upload_serializer().loads(upload_id)
+        except BadSignature:
+            return jsonify({'success': False, 'error': 'Unknown upload'}), 404
+        
+        result = firebase_api.get_resumable_upload_status(
+            upload['session_url'], upload['destination_path'], upload.get('size')
+        )
+        
+        if result['success']:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 400
             
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -270,20 +431,39 @@ def firebase_get_file_url(file_path):
 
 # Sync Routes
 @firebase_bp.route('/sync/to-firestore', methods=['POST'])
+@query_budget(5)
 def sync_to_firestore():
     """Sync alumni data from SQL database to Firestore"""
     try:
-        # Get all alumni from SQL database
-        alumni_list = Alumni.query.all()
-        
-        # Convert to dictionary format
-        alumni_data = []
-        for alumni in alumni_list:
-            alumni_data.append(alumni.to_dict())
-        
-        result = firebase_api.sync_alumni_to_firestore(alumni_data)
+        incremental = request.args.get('mode') == 'incremental'
+        try:
+            max_workers = max(1, min(int(request.args.get('workers', 4)), 16))
+        except ValueError:
+            max_workers = 4
+        
+        # Rows changed after this instant are picked up by the next incremental run
+        started_at = datetime.utcnow()
+        query = Alumni.query.order_by(Alumni.id)
+        watermark = None
+        if incremental:
+            watermark = firebase_api.get_sync_watermark()
+            if watermark:
+                query = query.filter(Alumni.updated_at >= watermark)
+        
+        # Stream rows from SQL rather than building the whole list first
+        alumni_data = (alumni.to_dict() for alumni in query.yield_per(1000))
+        
+        result = firebase_api.sync_alumni_to_firestore(
+            alumni_data,
+            max_workers=max_workers,
+            refresh_ids=request.args.get('refresh_ids') == 'true'
+        )
         
         if result['success']:
+            if result['error_count'] == 0:
+                firebase_api.set_sync_watermark(started_at)
+            result['mode'] = 'incremental' if incremental else 'full'
+            result['since'] = watermark.isoformat() if watermark else None
             return jsonify(result), 200
         else:
             return jsonify(result), 400
@@ -292,50 +472,53 @@ def sync_to_firestore():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @firebase_bp.route('/sync/from-firestore', methods=['POST'])
+@query_budget(allow_repeats=True)
 def sync_from_firestore():
     """Sync alumni data from Firestore to SQL database"""
     try:
-        # Get all alumni from Firestore
-        result = firebase_api.get_alumni_from_firestore()
+        if not firebase_api.db:
+            return jsonify({'success': False, 'error': 'Firestore client not available'}), 400
         
-        if not result['success']:
-            return jsonify(result), 400
+        try:
+            chunk_size = int(request.args.get('chunk_size', 500))
+        except ValueError:
+            chunk_size = 500
+        chunk_size = max(1, min(chunk_size, 5000))
+        
+        def log_progress(summary):
+            print(f"Firestore sync: {summary['processed']} processed, "
+                  f"{summary['inserted']} inserted, {summary['updated']} updated, {summary['errors']} errors")
+        
+        if request.args.get('progress') == 'stream':
+            # Stream one NDJSON progress line per committed chunk
+            def generate():
+                summary = {}
+                for summary in iter_upsert_alumni_by_email(firebase_api.stream_alumni_from_firestore(),
+                                                           chunk_size=chunk_size):
+                    log_progress(summary)
+                    yield json.dumps({'event': 'progress', **summary}) + '\n'
+                yield json.dumps({'event': 'done', 'success': True, **summary}) + '\n'
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
         
-        alumni_data = result['data']
-        success_count = 0
-        error_count = 0
-        
-        for alumni in alumni_data:
-            try:
-                # Check if alumni already exists
-                existing = Alumni.query.filter_by(email=alumni['email']).first()
-                
-                if existing:
-                    # Update existing
-                    for key, value in alumni.items():
-                        if hasattr(existing, key) and key not in ['id', 'created_at', 'updated_at']:
-                            setattr(existing, key, value)
-                else:
-                    # Create new
-                    new_alumni = Alumni(**alumni)
-                    db.session.add(new_alumni)
-                
-                success_count += 1
-            except Exception as e:
-                error_count += 1
-                print(f"Error processing alumni {alumni.get('email', 'unknown')}: {e}")
-        
-        # Commit changes
-        db.session.commit()
+        summary = upsert_alumni_by_email(
+            firebase_api.stream_alumni_from_firestore(),
+            chunk_size=chunk_size,
+            progress=log_progress
+        )
         
         return jsonify({
             'success': True,
-            'message': f'Synced {success_count} alumni from Firestore',
-            'success_count': success_count,
-            'error_count': error_count
+            'message': f"Synced {summary['inserted'] + summary['updated']} alumni from Firestore",
+            'success_count': summary['inserted'] + summary['updated'],
+            'error_count': summary['errors'],
+            'inserted_count': summary['inserted'],
+            'updated_count': summary['updated'],
+            'chunks': summary['chunks']
         }), 200
             
     except Exception as e:
+        db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
 
 # Statistics Routes
@@ -343,7 +526,10 @@ def sync_from_firestore():
 def firebase_stats():
     """Get statistics from Firestore"""
     try:
-        result = firebase_api.get_firestore_stats()
+        result = firebase_api.get_firestore_stats(
+            use_cache=request.args.get('fresh') != 'true',
+            recount=request.args.get('recount') == 'true'
+        )
         
         if result['success']:
             return jsonify(result), 200
@@ -364,10 +550,9 @@ def firebase_health():
             'auth': False
         }
         
-        # Check Firestore
+        # Check Firestore (served from the short-lived stats cache)
         try:
-            firebase_api.get_firestore_stats()
-            health_status['firestore'] = True
+            health_status['firestore'] = firebase_api.get_firestore_stats()['success']
         except:
             pass
         
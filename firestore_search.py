@@ -0,0 +1,90 @@
+import re
+
+# Document fields folded into the search_tokens array
+SEARCH_FIELDS = [
+    'first_name',
+    'last_name',
+    'email',
+    'department',
+    'degree',
+    'current_employer',
+    'job_title',
+    'industry',
+    'current_city',
+    'technical_skills',
+    'areas_of_interest',
+]
+
+TOKENS_FIELD = 'search_tokens'
+
+NGRAM_SIZE = 3
+
+# Rough English letter frequencies (percent), used to guess which query gram
+# matches the fewest documents; anything not listed counts as rare
+LETTER_FREQUENCY = {
+    'e': 12.7, 't': 9.1, 'a': 8.2, 'o': 7.5, 'i': 7.0, 'n': 6.7, 's': 6.3, 'h': 6.1,
+    'r': 6.0, 'd': 4.3, 'l': 4.0, 'c': 2.8, 'u': 2.8, 'm': 2.4, 'w': 2.4, 'f': 2.2,
+    'g': 2.0, 'y': 2.0, 'p': 1.9, 'b': 1.5, 'v': 1.0, 'k': 0.8, 'j': 0.2, 'x': 0.2,
+    'q': 0.1, 'z': 0.1,
+}
+RARE_CHARACTER_FREQUENCY = 0.1
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize(value):
+    return ' '.join(_WORD_RE.findall(str(value).lower())) if value is not None else ''
+
+
+def _term_grams(term):
+    """Index grams for one word: the word, its short prefixes and its trigrams"""
+    grams = {term}
+    for length in range(1, min(len(term), NGRAM_SIZE)):
+        grams.add(term[:length])
+    for start in range(len(term) - NGRAM_SIZE + 1):
+        grams.add(term[start:start + NGRAM_SIZE])
+    return grams
+
+
+def build_search_tokens(document, fields=SEARCH_FIELDS):
+    """Return the sorted token/trigram array to store on an alumni document"""
+    grams = set()
+    for field in fields:
+        for term in normalize(document.get(field)).split():
+            grams |= _term_grams(term)
+    return sorted(grams)
+
+
+def _gram_frequency(gram):
+    frequency = 1.0
+    for character in gram:
+        frequency *= LETTER_FREQUENCY.get(character, RARE_CHARACTER_FREQUENCY)
+    return frequency
+
+
+def query_gram(query):
+    """Pick the single indexed gram to query for a search string.
+
+    Every match contains every trigram of every query term, so any one of
+    them is a complete candidate filter; this takes the trigram of the
+    longest term made of the least common letters. Terms shorter than three
+    characters are looked up as themselves, which only matches the short
+    word prefixes stored at index time.
+    """
+    terms = normalize(query).split()
+    if not terms:
+        return None, []
+    longest = max(terms, key=len)
+    if len(longest) < NGRAM_SIZE:
+        return longest, terms
+    grams = {longest[i:i + NGRAM_SIZE] for i in range(len(longest) - NGRAM_SIZE + 1)}
+    return min(sorted(grams), key=_gram_frequency), terms
+
+
+def matches(document, terms, fields=SEARCH_FIELDS):
+    """Check that every query term occurs as a substring of the document's searchable text"""
+    haystacks = [normalize(document.get(field)) for field in fields]
+    for term in terms:
+        if not any(term in haystack for haystack in haystacks):
+            return False
+    return True
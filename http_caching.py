@@ -0,0 +1,87 @@
+import functools
+import hashlib
+import json
+import os
+from datetime import timezone
+from flask import request, session, make_response, current_app
+from change_tracking import get_version_info
+
+_template_fingerprint = None
+
+
+def template_fingerprint():
+    """Short hash of the template files' sizes and mtimes, so a deploy changes every ETag.
+
+    The asset manifest is included too, since pages embed the hashed asset URLs.
+    """
+    global _template_fingerprint
+    if _template_fingerprint is None:
+        digest = hashlib.sha1()
+        folder = os.path.join(current_app.root_path, current_app.template_folder or 'templates')
+        for root, _, files in sorted(os.walk(folder)):
+            for name in sorted(files):
+                stat = os.stat(os.path.join(root, name))
+                digest.update(f'{name}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+        digest.update(json.dumps(current_app.extensions.get('asset_manifest', {}), sort_keys=True).encode())
+        _template_fingerprint = digest.hexdigest()[:12]
+    return _template_fingerprint
+
+
+def make_etag(*parts):
+    # The rendered page also depends on who is logged in and on the templates
+    parts = parts + (session.get('username', ''), template_fingerprint())
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def table_validators(scope, table_name='alumni'):
+    """ETag and Last-Modified for views derived from a whole table"""
+    version, updated_at = get_version_info(table_name)
+    return make_etag(scope, table_name, version), updated_at
+
+
+def _as_utc(value):
+    return value.replace(tzinfo=timezone.utc, microsecond=0) if value is not None else None
+
+
+def _is_not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional_get(validators):
+    """Answer GETs with 304 when the client's ETag or Last-Modified is still current.
+
+    validators(**view_args) returns (etag, last_modified) or None to skip
+    conditional handling (e.g. for a missing row). It runs before the view,
+    so a 304 costs only the validator lookup.
+    """
+    def decorator(f):
+        @functools.wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return f(*args, **kwargs)
+            result = validators(**kwargs)
+            if result is None:
+                return f(*args, **kwargs)
+            etag, last_modified = result
+            last_modified = _as_utc(last_modified)
+
+            # Pending flash messages are rendered into the page, so it must be sent
+            if not session.get('_flashes') and _is_not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            # Pages sit behind login: browsers may keep them but must revalidate,
+            # and shared caches must not store them
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated_function
+    return decorator
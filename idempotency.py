@@ -0,0 +1,155 @@
+import functools
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import request, jsonify, make_response, current_app
+from sqlalchemy import select, update, delete
+from models import db, IdempotencyKey
+from sql_helpers import insert_ignoring_conflicts
+from query_budget import uncounted
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+_lock = threading.Lock()
+_table_ready = False
+_last_purge = 0.0
+
+
+def ensure_idempotency_table(connection):
+    """Create the idempotency_key table on databases that predate it"""
+    global _table_ready
+    if not _table_ready:
+        with _lock:
+            if not _table_ready:
+                IdempotencyKey.__table__.create(connection, checkfirst=True)
+                _table_ready = True
+
+
+def _purge_expired(now):
+    """Delete expired keys, at most once per IDEMPOTENCY_PURGE_INTERVAL per process"""
+    global _last_purge
+    interval = current_app.config.get('IDEMPOTENCY_PURGE_INTERVAL', 300)
+    if time.monotonic() - _last_purge < interval:
+        return
+    _last_purge = time.monotonic()
+    db.session.execute(delete(IdempotencyKey.__table__).where(IdempotencyKey.expires_at < now))
+
+
+def _claim(key_hash, request_hash):
+    """Insert an in-flight row for key_hash; returns None if claimed, else the existing row"""
+    config = current_app.config
+    now = datetime.utcnow()
+    ensure_idempotency_table(db.session.connection())
+    _purge_expired(now)
+
+    row = db.session.execute(
+        select(IdempotencyKey.__table__).where(IdempotencyKey.key_hash == key_hash)
+    ).first()
+    stale_before = now - timedelta(seconds=config['IDEMPOTENCY_LOCK_TIMEOUT'])
+    if row is not None and (row.expires_at < now or (row.status_code is None and row.created_at < stale_before)):
+        # Expired, or left in flight by a worker that died: take it over, unless another retry just did
+        result = db.session.execute(
+            update(IdempotencyKey.__table__)
+            .where(IdempotencyKey.key_hash == key_hash, IdempotencyKey.created_at == row.created_at)
+            .values(request_hash=request_hash, status_code=None, mimetype=None, body=None, created_at=now,
+                    expires_at=now + timedelta(seconds=config['IDEMPOTENCY_TTL_SECONDS']))
+        )
+        db.session.commit()
+        return None if result.rowcount == 1 else _claim(key_hash, request_hash)
+    if row is not None:
+        db.session.commit()
+        return row
+
+    result = db.session.execute(
+        insert_ignoring_conflicts(db.engine.dialect.name, IdempotencyKey.__table__, index_elements=['key_hash']),
+        {'key_hash': key_hash, 'request_hash': request_hash, 'created_at': now,
+         'expires_at': now + timedelta(seconds=config['IDEMPOTENCY_TTL_SECONDS'])}
+    )
+    db.session.commit()
+    if result.rowcount == 1:
+        return None
+    # A concurrent retry with the same key claimed it first
+    return db.session.execute(
+        select(IdempotencyKey.__table__).where(IdempotencyKey.key_hash == key_hash)
+    ).first()
+
+
+def _release(key_hash):
+    db.session.rollback()
+    db.session.execute(
+        delete(IdempotencyKey.__table__)
+        .where(IdempotencyKey.key_hash == key_hash, IdempotencyKey.status_code.is_(None))
+    )
+    db.session.commit()
+
+
+def _store(key_hash, response):
+    db.session.execute(
+        update(IdempotencyKey.__table__)
+        .where(IdempotencyKey.key_hash == key_hash)
+        .values(status_code=response.status_code, mimetype=response.mimetype,
+                body=response.get_data(as_text=True))
+    )
+    db.session.commit()
+
+
+def _replay(row):
+    response = current_app.response_class(row.body, status=row.status_code, mimetype=row.mimetype)
+    response.headers[REPLAYED_HEADER] = 'true'
+    return response
+
+
+def idempotent(f):
+    """Honour an Idempotency-Key header on a POST endpoint.
+
+    The first request with a key runs the view and stores its response;
+    retries with the same key and body get that response back without
+    running the view. Reusing a key with a different body is rejected with
+    422, and a retry that arrives while the first request is still running
+    gets 409. Server errors (5xx) are not stored, so they can be retried.
+    Requests without the header are handled as before.
+    """
+    @functools.wraps(f)
+    def decorated_function(*args, **kwargs):
+        client_key = request.headers.get(HEADER)
+        if not client_key:
+            return f(*args, **kwargs)
+        if len(client_key) > MAX_KEY_LENGTH:
+            return jsonify({'success': False, 'message': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'}), 400
+
+        key_hash = hashlib.sha256(f'{request.endpoint}\n{client_key}'.encode()).hexdigest()
+        request_hash = hashlib.sha256(request.get_data()).hexdigest()
+        try:
+            # Bookkeeping statements stay out of the route's query budget
+            with uncounted():
+                existing = _claim(key_hash, request_hash)
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'success': False, 'message': f'Error checking {HEADER}: {str(e)}'}), 500
+
+        if existing is not None:
+            if existing.request_hash != request_hash:
+                return jsonify({'success': False, 'message': f'{HEADER} was already used with a different request'}), 422
+            if existing.status_code is None:
+                response = jsonify({'success': False, 'message': 'A request with this key is still being processed'})
+                response.status_code = 409
+                response.headers['Retry-After'] = '1'
+                return response
+            return _replay(existing)
+
+        try:
+            response = make_response(f(*args, **kwargs))
+        except Exception:
+            with uncounted():
+                _release(key_hash)
+            raise
+        with uncounted():
+            if response.status_code >= 500 or response.is_streamed:
+                _release(key_hash)
+            else:
+                _store(key_hash, response)
+        return response
+    return decorated_function
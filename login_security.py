@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash
+from models import db, User
+
+
+class HashingBusy(Exception):
+    """Raised when the password hashing pool is full or a job waits past the timeout"""
+
+    def __init__(self, message, retry_after=1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LoginThrottled(Exception):
+    """Raised when a username or client address is out of login attempts"""
+
+    def __init__(self, retry_after):
+        super().__init__(f'Too many login attempts; retry in {retry_after} seconds')
+        self.retry_after = retry_after
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets held in a bounded LRU map.
+
+    Each key starts with `capacity` tokens and regains `refill_rate` tokens
+    per second. State is per process, so with N workers a client gets at
+    most N times the configured burst.
+    """
+
+    def __init__(self, capacity, refill_rate, max_keys=10000):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, tokens=1):
+        """Take tokens for key; returns 0 on success or the seconds until enough have refilled"""
+        now = time.monotonic()
+        with self._lock:
+            available, updated_at = self._buckets.pop(key, (self.capacity, now))
+            available = min(self.capacity, available + (now - updated_at) * self.refill_rate)
+            if available >= tokens:
+                available -= tokens
+                retry_after = 0
+            else:
+                retry_after = max(1, int((tokens - available) / self.refill_rate + 0.999))
+            self._buckets[key] = (available, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+class PasswordHasher:
+    """Runs password hashing on a small dedicated pool with a bounded backlog.
+
+    hashlib releases the GIL while deriving keys, so the pool size caps how
+    many cores hashing can take, and requests beyond the backlog are turned
+    away immediately instead of queueing behind an attack.
+    """
+
+    def __init__(self, method, workers=2, max_pending=8, timeout=10.0):
+        self.method = method
+        self.timeout = timeout
+        self._prefix = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def _run(self, function, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy('Password hashing is at capacity')
+        try:
+            future = self._executor.submit(function, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # The job keeps its backlog slot until it finishes
+            raise HashingBusy('Password hashing timed out')
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when a stored hash was made with different parameters than the configured method"""
+        if self._prefix is None:
+            # Werkzeug fills in default parameters (e.g. iterations), so compare against a real hash
+            self._prefix = self.hash('').split('$', 1)[0]
+        return password_hash.split('$', 1)[0] != self._prefix
+
+
+class LoginGuard:
+    """Throttled, pool-backed password checks for the login and change-password views"""
+
+    def __init__(self, hasher, username_limiter, address_limiter):
+        self.hasher = hasher
+        self.username_limiter = username_limiter
+        self.address_limiter = address_limiter
+
+    def _throttle(self, username, remote_addr):
+        # Both buckets are charged before any hash work is done
+        retry_after = max(
+            self.address_limiter.consume(remote_addr or 'unknown'),
+            self.username_limiter.consume((username or '').strip().lower())
+        )
+        if retry_after:
+            raise LoginThrottled(retry_after)
+
+    def authenticate(self, username, password, remote_addr):
+        """Return the User for valid credentials, else None.
+
+        Raises LoginThrottled or HashingBusy before touching the hash when
+        the caller should back off. Hashes made with outdated parameters
+        are upgraded after a successful check.
+        """
+        self._throttle(username, remote_addr)
+        user = User.query.filter_by(username=username).first()
+        if not user or not password or not self.hasher.verify(user.password_hash, password):
+            return None
+        self.username_limiter.reset((username or '').strip().lower())
+        try:
+            if self.hasher.needs_rehash(user.password_hash):
+                user.password_hash = self.hasher.hash(password)
+                db.session.commit()
+        except Exception as e:
+            # The login itself succeeded; try the upgrade again next time
+            db.session.rollback()
+            print(f"Error upgrading password hash for {user.username}: {e}")
+        return user
+
+    def check_current_password(self, user, password, remote_addr):
+        """Verify a logged-in user's password, throttled like a login attempt"""
+        self._throttle(user.username, remote_addr)
+        return bool(password) and self.hasher.verify(user.password_hash, password)
+
+    def set_password(self, user, password):
+        user.password_hash = self.hasher.hash(password)
+
+
+def init_login_guard(app):
+    config = app.config
+    return LoginGuard(
+        PasswordHasher(
+            config['PASSWORD_HASH_METHOD'],
+            workers=config['PASSWORD_HASH_WORKERS'],
+            max_pending=config['PASSWORD_HASH_MAX_PENDING'],
+        ),
+        username_limiter=TokenBucketLimiter(
+            config['LOGIN_USERNAME_BURST'], config['LOGIN_USERNAME_PER_MINUTE'] / 60.0
+        ),
+        address_limiter=TokenBucketLimiter(
+            config['LOGIN_IP_BURST'], config['LOGIN_IP_PER_MINUTE'] / 60.0
+        ),
+    )
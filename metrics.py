@@ -0,0 +1,277 @@
+import functools
+import inspect
+import os
+import sqlite3
+import threading
+import time
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Metric families: name -> (type, help)
+FAMILIES = {
+    'http_requests_total': ('counter', 'HTTP requests by endpoint, method and status code'),
+    'http_request_duration_seconds': ('histogram', 'HTTP request latency by endpoint and method'),
+    'sql_statements_total': ('counter', 'SQL statements executed, by endpoint'),
+    'sql_duration_seconds_total': ('counter', 'Time spent executing SQL statements, by endpoint'),
+    'firebase_calls_total': ('counter', 'FirebaseAPI calls by service, operation and outcome'),
+    'firebase_call_duration_seconds': ('histogram', 'FirebaseAPI call latency by service and operation'),
+    'alumni_duplicate_checks_total': ('counter', 'Pre-insert duplicate checks by result (filter_miss skips the query)'),
+}
+
+# Label used for statements and Firebase calls made outside a request (CLI, background threads)
+NO_ENDPOINT = '<none>'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(**labels):
+    return ','.join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items()))
+
+
+def _sort_key(labels):
+    # Order histogram buckets numerically, with +Inf last
+    others, _, rest = labels.partition('le="')
+    le, _, rest = rest.partition('"')
+    bound = float('inf') if le == '+Inf' else float(le) if le else 0.0
+    return others + rest, bound
+
+
+class MetricsRegistry:
+    """Per-process metric deltas, periodically added into a SQLite file shared by all workers.
+
+    Every gunicorn worker flushes what it recorded since its last flush into
+    the same file with additive upserts, so reading the file gives totals
+    across workers (lagging by at most one flush interval per worker).
+    """
+
+    def __init__(self, path=None, flush_interval=5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._schema_ready = False
+
+    # Recording
+    def inc(self, name, value=1.0, **labels):
+        key = (name, _labels(**labels))
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0.0) + value
+        self._ensure_flusher()
+
+    def observe(self, family, value, **labels):
+        """Add one observation to a histogram family"""
+        with self._lock:
+            # Every bucket gets a sample, even at 0, so series are complete from the first scrape
+            for bound in LATENCY_BUCKETS:
+                key = (family + '_bucket', _labels(le=bound, **labels))
+                self._pending[key] = self._pending.get(key, 0.0) + (1 if value <= bound else 0)
+            for suffix, amount in (('_bucket', 1), ('_sum', value), ('_count', 1)):
+                key = (family + suffix, _labels(le='+Inf', **labels) if suffix == '_bucket' else _labels(**labels))
+                self._pending[key] = self._pending.get(key, 0.0) + amount
+        self._ensure_flusher()
+
+    # Aggregation across workers
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        if not self._schema_ready:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS metric_sample ('
+                'name TEXT NOT NULL, labels TEXT NOT NULL, value REAL NOT NULL, '
+                'PRIMARY KEY (name, labels))'
+            )
+            self._schema_ready = True
+        return connection
+
+    def flush(self):
+        """Add this process's pending deltas to the shared file"""
+        if not self.path:
+            return
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            try:
+                connection = self._connect()
+                try:
+                    connection.execute('BEGIN IMMEDIATE')
+                    connection.executemany(
+                        'INSERT INTO metric_sample (name, labels, value) VALUES (?, ?, ?) '
+                        'ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value',
+                        [(name, labels, value) for (name, labels), value in pending.items()]
+                    )
+                    connection.execute('COMMIT')
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                print(f"Error flushing metrics: {e}")
+                # Keep the deltas for the next attempt
+                with self._lock:
+                    for key, value in pending.items():
+                        self._pending[key] = self._pending.get(key, 0.0) + value
+
+    def samples(self):
+        """Return {(name, labels): value} across all workers, or this process only without a file"""
+        if not self.path:
+            with self._lock:
+                return dict(self._pending)
+        self.flush()
+        try:
+            connection = self._connect()
+            try:
+                return {(name, labels): value for name, labels, value
+                        in connection.execute('SELECT name, labels, value FROM metric_sample')}
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            print(f"Error reading metrics: {e}")
+            with self._lock:
+                return dict(self._pending)
+
+    def _ensure_flusher(self):
+        # Started lazily and per pid, so each forked worker gets its own thread
+        if not self.path or (self._pid == os.getpid() and self._thread is not None):
+            return
+        with self._flush_lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='metrics-flush', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    # Exposition
+    def render(self):
+        """Prometheus text exposition format (0.0.4)"""
+        samples = self.samples()
+        lines = []
+        for family, (metric_type, help_text) in FAMILIES.items():
+            names = [family + suffix for suffix in ('_bucket', '_sum', '_count')] if metric_type == 'histogram' else [family]
+            family_samples = sorted(
+                ((key, value) for key, value in samples.items() if key[0] in names),
+                key=lambda item: (names.index(item[0][0]), _sort_key(item[0][1]))
+            )
+            if not family_samples:
+                continue
+            lines.append(f'# HELP {family} {help_text}')
+            lines.append(f'# TYPE {family} {metric_type}')
+            for (name, labels), value in family_samples:
+                rendered = f'{value:.6f}'.rstrip('0').rstrip('.') if value != int(value) else str(int(value))
+                lines.append(f'{name}{{{labels}}} {rendered}' if labels else f'{name} {rendered}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def current_endpoint():
+    if has_request_context():
+        return request.endpoint or 'unmatched'
+    return NO_ENDPOINT
+
+
+# HTTP instrumentation
+def _start_request_timer():
+    g._metrics_started = time.perf_counter()
+
+
+def _remember_status(response):
+    g._metrics_status = response.status_code
+    return response
+
+
+def _record_request(exception=None):
+    started = g.pop('_metrics_started', None)
+    if started is None:
+        return
+    status = g.pop('_metrics_status', 500 if exception is not None else 200)
+    endpoint = current_endpoint()
+    if endpoint == 'metrics':
+        return
+    registry.inc('http_requests_total', endpoint=endpoint, method=request.method, status=status)
+    registry.observe('http_request_duration_seconds', time.perf_counter() - started,
+                     endpoint=endpoint, method=request.method)
+
+
+# SQL instrumentation; listens on every Engine, so it covers Flask-SQLAlchemy and Core alike
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_metrics_query_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('_metrics_query_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    endpoint = current_endpoint()
+    registry.inc('sql_statements_total', endpoint=endpoint)
+    registry.inc('sql_duration_seconds_total', elapsed, endpoint=endpoint)
+
+
+# FirebaseAPI instrumentation
+def _firebase_outcome(result):
+    if isinstance(result, dict) and result.get('success') is False:
+        return 'error'
+    return 'ok'
+
+
+def track_firebase_call(service):
+    """Count and time a FirebaseAPI method (service is firestore, storage or auth)"""
+    def decorator(f):
+        operation = f.__name__
+
+        def record(started, outcome):
+            registry.inc('firebase_calls_total', service=service, operation=operation, outcome=outcome)
+            registry.observe('firebase_call_duration_seconds', time.perf_counter() - started,
+                             service=service, operation=operation)
+
+        if inspect.isgeneratorfunction(f):
+            # Generators are timed over their whole iteration
+            @functools.wraps(f)
+            def generator_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                outcome = 'error'
+                try:
+                    yield from f(*args, **kwargs)
+                    outcome = 'ok'
+                finally:
+                    record(started, outcome)
+            return generator_wrapper
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = 'error'
+            try:
+                result = f(*args, **kwargs)
+                outcome = _firebase_outcome(result)
+                return result
+            finally:
+                record(started, outcome)
+        return wrapper
+    return decorator
+
+
+def init_app(app):
+    """Install the request hooks and point the registry at the configured file"""
+    registry.path = app.config.get('METRICS_DB_PATH') or None
+    registry.flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', 5.0)
+    app.before_request(_start_request_timer)
+    app.after_request(_remember_status)
+    app.teardown_request(_record_request)
@@ -1,3 +1,4 @@
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -7,12 +8,12 @@ db = SQLAlchemy()
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
-    password_hash = db.Column(db.String(120), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)
     role = db.Column(db.String(20), default='admin')  # admin, staff, etc.
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, current_app.config['PASSWORD_HASH_METHOD'])
     
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
@@ -57,6 +58,12 @@ class Alumni(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Composite indexes backing keyset pagination of the list view
+    __table_args__ = (
+        db.Index('ix_alumni_last_name_id', 'last_name', 'id'),
+        db.Index('ix_alumni_department_last_name', 'department', 'last_name'),
+    )
+
     def __repr__(self):
         return f'<Alumni {self.first_name} {self.last_name}>'
 
@@ -84,4 +91,77 @@ class Alumni(db.Model):
             'technical_skills': self.technical_skills,
             'languages_known': self.languages_known,
             'areas_of_interest': self.areas_of_interest
-        } 
\ No newline at end of file
+        }
+
+class TableVersion(db.Model):
+    """Monotonic change counter per table, shared by every worker process"""
+    __tablename__ = 'table_version'
+
+    table_name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<TableVersion {self.table_name}={self.version}>'
+
+# Normalized skills, languages and interests parsed from the Alumni text columns
+class Skill(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)  # lower-cased lookup key
+    label = db.Column(db.String(100), nullable=False)  # spelling as first entered
+
+    def __repr__(self):
+        return f'<Skill {self.label}>'
+
+class Language(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    label = db.Column(db.String(100), nullable=False)
+
+    def __repr__(self):
+        return f'<Language {self.label}>'
+
+class Interest(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    label = db.Column(db.String(100), nullable=False)
+
+    def __repr__(self):
+        return f'<Interest {self.label}>'
+
+# Link tables; the primary key serves per-alumni lookups, the reverse index serves tag lookups
+alumni_skill = db.Table(
+    'alumni_skill',
+    db.Column('alumni_id', db.Integer, db.ForeignKey('alumni.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_alumni_skill_skill_id_alumni_id', 'skill_id', 'alumni_id'),
+)
+
+alumni_language = db.Table(
+    'alumni_language',
+    db.Column('alumni_id', db.Integer, db.ForeignKey('alumni.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('language_id', db.Integer, db.ForeignKey('language.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_alumni_language_language_id_alumni_id', 'language_id', 'alumni_id'),
+)
+
+alumni_interest = db.Table(
+    'alumni_interest',
+    db.Column('alumni_id', db.Integer, db.ForeignKey('alumni.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('interest_id', db.Integer, db.ForeignKey('interest.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_alumni_interest_interest_id_alumni_id', 'interest_id', 'alumni_id'),
+)
+
+class IdempotencyKey(db.Model):
+    """Response stored for a client's Idempotency-Key, replayed to retries until it expires"""
+    __tablename__ = 'idempotency_key'
+
+    key_hash = db.Column(db.String(64), primary_key=True)  # sha256 of endpoint + client key
+    request_hash = db.Column(db.String(64), nullable=False)  # sha256 of the request body
+    status_code = db.Column(db.Integer)  # NULL while the first request is still running
+    mimetype = db.Column(db.String(100))
+    body = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<IdempotencyKey {self.key_hash[:12]} {self.status_code}>'
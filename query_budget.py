@@ -0,0 +1,103 @@
+import contextlib
+import functools
+import re
+from collections import Counter
+from flask import g, request, current_app, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# QUERY_BUDGET_MODE values: off, log (print a warning) or raise (fail the request)
+MODES = ('off', 'log', 'raise')
+
+# Placeholders in an expanded IN list, for any DBAPI paramstyle
+_PLACEHOLDER = r'(?:\?|%s|%\(\w+\)s|:\w+)'
+_IN_LIST_RE = re.compile(r'\(\s*' + _PLACEHOLDER + r'(?:\s*,\s*' + _PLACEHOLDER + r')*\s*\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in raise mode when a request runs more SQL than its route allows"""
+
+
+def statement_shape(statement):
+    """Normalize a statement so executions differing only in parameters compare equal"""
+    shape = _WHITESPACE_RE.sub(' ', statement).strip()
+    return _IN_LIST_RE.sub('(?)', shape)
+
+
+def query_budget(max_queries=None, allow_repeats=False):
+    """Declare the most SQL statements a route may run per request.
+
+    allow_repeats=True turns off the repeated-statement (N+1) check for
+    routes that legitimately run the same statement per chunk, such as
+    the bulk ingest endpoints.
+    """
+    def decorator(f):
+        @functools.wraps(f)
+        def decorated_function(*args, **kwargs):
+            g._query_budget = max_queries
+            g._query_allow_repeats = allow_repeats
+            return f(*args, **kwargs)
+        decorated_function.query_budget = max_queries
+        return decorated_function
+    return decorator
+
+
+@contextlib.contextmanager
+def uncounted():
+    """Leave the statements run inside this block out of the request's budget"""
+    shapes = g.pop('_query_shapes', None) if has_request_context() else None
+    try:
+        yield
+    finally:
+        if shapes is not None:
+            g._query_shapes = shapes
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        shapes = g.get('_query_shapes')
+        if shapes is not None:
+            shapes[statement_shape(statement)] += 1
+
+
+def _start_counting():
+    g._query_shapes = Counter()
+
+
+def _check_budget(response):
+    shapes = g.pop('_query_shapes', None)
+    if shapes is None:
+        return response
+    total = sum(shapes.values())
+    response.headers['X-Query-Count'] = str(total)
+
+    problems = []
+    budget = g.get('_query_budget', current_app.config.get('QUERY_BUDGET_DEFAULT'))
+    if budget is not None and total > budget:
+        problems.append(f'{total} queries exceeds the budget of {budget}')
+    if not g.get('_query_allow_repeats'):
+        threshold = current_app.config.get('QUERY_REPEAT_THRESHOLD', 5)
+        for shape, count in shapes.most_common():
+            if count < threshold:
+                break
+            problems.append(f'possible N+1: statement ran {count} times: {shape[:200]}')
+
+    if problems:
+        message = f"{request.method} {request.path} ({request.endpoint}): " + '; '.join(problems)
+        if current_app.config.get('QUERY_BUDGET_MODE') == 'raise':
+            raise QueryBudgetExceeded(message)
+        print(f"Query budget warning: {message}")
+    return response
+
+
+def init_app(app):
+    """Count statements per request when QUERY_BUDGET_MODE is log or raise"""
+    mode = app.config.get('QUERY_BUDGET_MODE', 'off')
+    if mode not in MODES:
+        raise ValueError(f"QUERY_BUDGET_MODE must be one of {', '.join(MODES)}")
+    if mode == 'off':
+        return
+    app.before_request(_start_counting)
+    app.after_request(_check_budget)
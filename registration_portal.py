@@ -1,6 +1,8 @@
 from flask import Flask, render_template, request, jsonify, redirect, url_for
 from models import db, Alumni
 from config import Config
+import change_tracking  # registers the Alumni change-version hooks shared with app.py
+import alumni_tags  # registers the hook that links skills, languages and interests on every Alumni write
 from datetime import datetime
 import sys
 
@@ -0,0 +1,192 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from alumni_ingest import bulk_insert_alumni
+
+# Submission states
+QUEUED = 'queued'
+PROCESSING = 'processing'
+STORED = 'stored'
+FAILED = 'failed'
+
+
+class RegistrationQueue:
+    """Durable write-behind queue for public registration submissions.
+
+    Submissions are appended to a small SQLite file of their own, so the
+    request never waits on the main database's write lock. A background
+    thread drains the queue into the Alumni table in batches.
+    """
+
+    def __init__(self, path, batch_size=200, poll_interval=1.0, stale_after=300):
+        self.path = path
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._app = None
+        self._thread = None
+        self._wakeup = threading.Event()
+        self._start_lock = threading.Lock()
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _init_schema(self):
+        connection = self._connect()
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS registration_submission (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                alumni_id INTEGER,
+                error TEXT,
+                claimed_at REAL,
+                created_at TEXT NOT NULL,
+                processed_at TEXT
+            )
+        """)
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS ix_registration_submission_status '
+            'ON registration_submission (status, seq)'
+        )
+
+    # Producer side
+    def enqueue(self, payload):
+        """Persist a submission and return its id; the caller can acknowledge immediately"""
+        submission_id = uuid.uuid4().hex
+        self._connect().execute(
+            'INSERT INTO registration_submission (id, payload, status, created_at) VALUES (?, ?, ?, ?)',
+            (submission_id, json.dumps(payload), QUEUED, datetime.utcnow().isoformat())
+        )
+        self._wakeup.set()
+        return submission_id
+
+    def get_status(self, submission_id):
+        """Return the processing state of a submission, or None if unknown"""
+        row = self._connect().execute(
+            'SELECT id, status, alumni_id, error, created_at, processed_at '
+            'FROM registration_submission WHERE id = ?',
+            (submission_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def pending_count(self):
+        return self._connect().execute(
+            'SELECT COUNT(*) FROM registration_submission WHERE status IN (?, ?)', (QUEUED, PROCESSING)
+        ).fetchone()[0]
+
+    # Consumer side
+    def _claim_batch(self):
+        """Atomically claim the oldest queued submissions for this process"""
+        connection = self._connect()
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            # Reclaim work from a worker that died mid-batch
+            connection.execute(
+                'UPDATE registration_submission SET status = ?, claimed_at = NULL '
+                'WHERE status = ? AND claimed_at < ?',
+                (QUEUED, PROCESSING, now - self.stale_after)
+            )
+            rows = connection.execute(
+                'SELECT id, payload FROM registration_submission WHERE status = ? ORDER BY seq LIMIT ?',
+                (QUEUED, self.batch_size)
+            ).fetchall()
+            if rows:
+                connection.executemany(
+                    'UPDATE registration_submission SET status = ?, claimed_at = ? WHERE id = ?',
+                    [(PROCESSING, now, row['id']) for row in rows]
+                )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return [(row['id'], json.loads(row['payload'])) for row in rows]
+
+    def _record_results(self, submission_ids, results):
+        processed_at = datetime.utcnow().isoformat()
+        updates = []
+        for submission_id, result in zip(submission_ids, results):
+            if result['status'] == 'inserted':
+                updates.append((STORED, result.get('id'), None, processed_at, submission_id))
+            else:
+                updates.append((FAILED, None, '; '.join(result.get('errors', [])), processed_at, submission_id))
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        connection.executemany(
+            'UPDATE registration_submission SET status = ?, alumni_id = ?, error = ?, processed_at = ? '
+            'WHERE id = ?',
+            updates
+        )
+        connection.execute('COMMIT')
+
+    def drain_once(self):
+        """Move one batch from the queue into the Alumni table; returns the batch size"""
+        batch = self._claim_batch()
+        if not batch:
+            return 0
+        submission_ids = [submission_id for submission_id, _ in batch]
+        try:
+            _, results = bulk_insert_alumni((payload for _, payload in batch), record_format='portal')
+        except Exception:
+            # Hand the batch back so the next attempt picks it up again
+            self._connect().executemany(
+                'UPDATE registration_submission SET status = ?, claimed_at = NULL WHERE id = ?',
+                [(QUEUED, submission_id) for submission_id in submission_ids]
+            )
+            raise
+        self._record_results(submission_ids, results)
+        return len(batch)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                with self._app.app_context():
+                    while self.drain_once():
+                        pass
+            except Exception as e:
+                print(f"Error draining registration queue: {e}")
+                time.sleep(self.poll_interval)
+
+    def start(self, app):
+        """Start the background drain thread for this process if it is not running"""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._app = app
+            self._thread = threading.Thread(target=self._run, name='registration-queue', daemon=True)
+            self._thread.start()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_registration_queue(app):
+    """Return the process-wide queue, creating it and its drain thread on first use"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = RegistrationQueue(
+                    app.config['REGISTRATION_QUEUE_PATH'],
+                    batch_size=app.config['REGISTRATION_QUEUE_BATCH_SIZE'],
+                    poll_interval=app.config['REGISTRATION_QUEUE_POLL_INTERVAL']
+                )
+    _queue.start(app)
+    return _queue
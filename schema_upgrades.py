@@ -0,0 +1,41 @@
+from sqlalchemy import inspect
+from models import db, Alumni
+from search_index import ensure_search_index
+from change_tracking import ensure_version_table
+from alumni_tags import ensure_tag_tables
+from idempotency import ensure_idempotency_table
+
+
+def upgrade_schema(connection):
+    """Create the tables, triggers and indexes added since the database was first created.
+
+    db.create_all() skips tables that already exist, so indexes added to
+    Alumni.__table_args__ later are created here (CREATE INDEX IF NOT EXISTS).
+
+    Every step is idempotent. Returns False on a database without an alumni
+    table yet; db.create_all() builds everything there.
+    """
+    if not inspect(connection).has_table('alumni'):
+        return False
+    for index in Alumni.__table__.indexes:
+        index.create(connection, checkfirst=True)
+    ensure_version_table(connection)
+    ensure_tag_tables(connection)
+    ensure_idempotency_table(connection)
+    ensure_search_index(connection)
+    return True
+
+
+def init_app(app):
+    """Run the schema upgrades once at startup.
+
+    The lazy checks in each module stay as a fallback, but after this they
+    are no-ops, so request query budgets only see steady-state statements.
+    """
+    with app.app_context():
+        try:
+            with db.engine.begin() as connection:
+                upgrade_schema(connection)
+        except Exception as e:
+            # Not fatal: the first request that needs a table creates it instead
+            print(f"Error upgrading database schema: {e}")
@@ -0,0 +1,140 @@
+import re
+from sqlalchemy import event, text
+from models import db, Alumni
+
+# Fields covered by the full-text index, highest weight first
+SEARCH_FIELDS = [
+    'first_name',
+    'last_name',
+    'current_employer',
+    'job_title',
+    'industry',
+    'current_city',
+    'technical_skills',
+    'areas_of_interest',
+]
+
+# bm25() column weights for the SQLite index, in SEARCH_FIELDS order
+SQLITE_WEIGHTS = [10.0, 10.0, 5.0, 5.0, 3.0, 2.0, 4.0, 2.0]
+
+# tsvector weight classes for the Postgres index
+POSTGRES_WEIGHTS = {
+    'first_name': 'A',
+    'last_name': 'A',
+    'current_employer': 'B',
+    'job_title': 'B',
+    'technical_skills': 'B',
+    'industry': 'C',
+    'areas_of_interest': 'C',
+    'current_city': 'D',
+}
+
+MAX_RESULTS = 100
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Dialects for which the index has already been verified in this process
+_ready = set()
+
+
+def _sqlite_ddl():
+    columns = ', '.join(SEARCH_FIELDS)
+    new_values = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+    old_values = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS alumni_fts USING fts5("
+        f"{columns}, content='alumni', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        # External-content triggers keep the index in step with every write to alumni
+        f"CREATE TRIGGER IF NOT EXISTS alumni_fts_ai AFTER INSERT ON alumni BEGIN "
+        f"INSERT INTO alumni_fts(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS alumni_fts_ad AFTER DELETE ON alumni BEGIN "
+        f"INSERT INTO alumni_fts(alumni_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS alumni_fts_au AFTER UPDATE ON alumni BEGIN "
+        f"INSERT INTO alumni_fts(alumni_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO alumni_fts(rowid, {columns}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def _postgres_ddl():
+    vector = ' || '.join(
+        f"setweight(to_tsvector('simple'::regconfig, coalesce({field}, '')), '{weight}')"
+        for field, weight in POSTGRES_WEIGHTS.items()
+    )
+    return [
+        # A stored generated column is recomputed by Postgres on every insert and update
+        f"ALTER TABLE alumni ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({vector}) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_alumni_search_vector ON alumni USING GIN (search_vector)",
+    ]
+
+
+def ensure_search_index(connection, rebuild=False):
+    """Create the full-text index for the current dialect if it is missing"""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'alumni_fts'"
+        )).first()
+        for statement in _sqlite_ddl():
+            connection.execute(text(statement))
+        if rebuild or not exists:
+            # Populate from rows written before the index existed
+            connection.execute(text("INSERT INTO alumni_fts(alumni_fts) VALUES ('rebuild')"))
+    elif dialect == 'postgresql':
+        for statement in _postgres_ddl():
+            connection.execute(text(statement))
+    else:
+        return False
+    _ready.add(dialect)
+    return True
+
+
+def _ensure_ready():
+    engine = db.engine
+    if engine.dialect.name not in _ready:
+        with engine.begin() as connection:
+            ensure_search_index(connection)
+    return engine.dialect.name
+
+
+def _tokens(query):
+    return [token.lower() for token in _TOKEN_RE.findall(query or '')][:16]
+
+
+def search_alumni(query, limit=20):
+    """Run a ranked full-text search and return (Alumni, score) pairs, best first"""
+    tokens = _tokens(query)
+    if not tokens:
+        return []
+    limit = max(1, min(int(limit), MAX_RESULTS))
+    dialect = _ensure_ready()
+
+    if dialect == 'sqlite':
+        # Every token must match; each is a prefix match so partial words still hit
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+        rows = db.session.execute(text(
+            f"SELECT rowid, -bm25(alumni_fts, {weights}) AS score FROM alumni_fts "
+            f"WHERE alumni_fts MATCH :match ORDER BY bm25(alumni_fts, {weights}) LIMIT :limit"
+        ), {'match': match, 'limit': limit}).all()
+    elif dialect == 'postgresql':
+        tsquery = ' & '.join(f'{token}:*' for token in tokens)
+        rows = db.session.execute(text(
+            "SELECT id, ts_rank_cd(search_vector, q) AS score "
+            "FROM alumni, to_tsquery('simple', :tsquery) AS q "
+            "WHERE search_vector @@ q ORDER BY score DESC, id LIMIT :limit"
+        ), {'tsquery': tsquery, 'limit': limit}).all()
+    else:
+        raise RuntimeError(f'Full-text search is not supported on {dialect}')
+
+    scores = {row[0]: float(row[1]) for row in rows}
+    if not scores:
+        return []
+    alumni_by_id = {alumni.id: alumni for alumni in Alumni.query.filter(Alumni.id.in_(scores)).all()}
+    return [(alumni_by_id[row_id], score) for row_id, score in scores.items() if row_id in alumni_by_id]
+
+
+@event.listens_for(Alumni.__table__, 'after_create')
+def _create_search_index(target, connection, **kw):
+    # A fresh alumni table may sit next to a stale index left by a drop_all
+    ensure_search_index(connection, rebuild=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import insert
+
+
+def insert_ignoring_conflicts(dialect_name, table, index_elements=None):
+    """INSERT ... ON CONFLICT DO NOTHING on SQLite and PostgreSQL, else a plain INSERT.
+
+    index_elements names the conflict target; without it, rows conflicting
+    on any unique constraint are skipped. Skipped rows show up as a
+    rowcount of 0. Other dialects raise IntegrityError instead, which
+    callers must handle.
+    """
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return insert(table)
+    return dialect_insert(table).on_conflict_do_nothing(index_elements=index_elements)
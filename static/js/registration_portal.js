@@ -11,6 +11,24 @@ document.addEventListener('DOMContentLoaded', function() {
     addInputValidation();
 });
 
+// Resubmitting the same form data reuses its Idempotency-Key, so a retry
+// after a timeout gets the original result instead of a second registration
+let submission = { payload: null, key: null };
+
+function newIdempotencyKey() {
+    if (window.crypto && typeof window.crypto.randomUUID === 'function') {
+        return window.crypto.randomUUID();
+    }
+    return Date.now().toString(36) + '-' + Math.random().toString(36).slice(2);
+}
+
+function idempotencyKeyFor(payload) {
+    if (submission.payload !== payload) {
+        submission = { payload: payload, key: newIdempotencyKey() };
+    }
+    return submission.key;
+}
+
 function handleFormSubmit(event) {
     event.preventDefault();
     
@@ -30,12 +48,14 @@ function handleFormSubmit(event) {
     submitBtn.disabled = true;
     
     // Submit form data to backend API
+    const payload = JSON.stringify(data);
     fetch('/api/registration-portal/submit', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
+            'Idempotency-Key': idempotencyKeyFor(payload),
         },
-        body: JSON.stringify(data)
+        body: payload
     })
     .then(response => response.json())
     .then(result => {
@@ -0,0 +1,69 @@
+import io
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from werkzeug.wsgi import LimitedStream
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from firebase_api import FirebaseAPI  # noqa: E402
+
+
+class _SessionHandler(BaseHTTPRequestHandler):
+    """Fake resumable session: records each PUT and reports what it has persisted"""
+    received = []
+
+    def do_PUT(self):
+        if self.headers.get('Transfer-Encoding'):
+            body = b''
+        else:
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.received.append((dict(self.headers), body))
+        self.send_response(308)
+        if body:
+            self.send_header('Range', f'bytes=0-{len(body) - 1}')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ResumableChunkTest(unittest.TestCase):
+    def setUp(self):
+        _SessionHandler.received = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _SessionHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.session_url = f'http://127.0.0.1:{self.server.server_port}/upload'
+        self.api = FirebaseAPI.__new__(FirebaseAPI)
+        self.api.storage_bucket = object()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_chunk_is_sent_with_content_length_only(self):
+        data = os.urandom(256 * 1024)
+        stream = LimitedStream(io.BytesIO(data), len(data))
+        result = self.api.upload_resumable_chunk(self.session_url, 'resumes/a.pdf', stream, 0, len(data), 1024 * 1024)
+
+        self.assertEqual(result, {'success': True, 'complete': False, 'next_offset': len(data)})
+        headers, body = _SessionHandler.received[0]
+        self.assertNotIn('Transfer-Encoding', headers)
+        self.assertEqual(headers['Content-Length'], str(len(data)))
+        self.assertEqual(headers['Content-Range'], f'bytes 0-{len(data) - 1}/{1024 * 1024}')
+        self.assertEqual(body, data)
+
+    def test_short_body_is_not_forwarded(self):
+        stream = LimitedStream(io.BytesIO(b'x' * 100), 100)
+        result = self.api.upload_resumable_chunk(self.session_url, 'resumes/a.pdf', stream, 0, 200, 200)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(_SessionHandler.received, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class VerifiedTokenCache:
+    """Bounded LRU cache of decoded Firebase ID tokens.
+
+    Entries are keyed by a SHA-256 of the raw token, so tokens themselves
+    are never held in memory, and expire at the token's own `exp` claim.
+    Entries verified with a revocation check are trusted for revocation
+    purposes only for `revocation_ttl` seconds; after that the caller has
+    to verify again with check_revoked=True.
+    """
+
+    def __init__(self, max_size=10000, revocation_ttl=60):
+        self.max_size = max_size
+        self.revocation_ttl = revocation_ttl
+        self._entries = OrderedDict()
+        self._keys_by_uid = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(id_token):
+        return hashlib.sha256(id_token.encode('utf-8')).hexdigest()
+
+    def get(self, id_token, check_revoked=False):
+        """Return the cached decoded token, or None on a miss"""
+        key = self._key(id_token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                decoded, expires_at, revocation_checked_at = entry
+                if now >= expires_at:
+                    self._remove(key, decoded.get('uid'))
+                    entry = None
+                elif check_revoked and (revocation_checked_at is None
+                                        or now - revocation_checked_at > self.revocation_ttl):
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, id_token, decoded, check_revoked=False):
+        """Cache a freshly verified token until its exp claim"""
+        expires_at = decoded.get('exp')
+        if not expires_at:
+            return
+        key = self._key(id_token)
+        uid = decoded.get('uid')
+        revocation_checked_at = time.time() if check_revoked else None
+        with self._lock:
+            self._entries[key] = (decoded, float(expires_at), revocation_checked_at)
+            self._entries.move_to_end(key)
+            if uid:
+                self._keys_by_uid.setdefault(uid, set()).add(key)
+            while len(self._entries) > self.max_size:
+                old_key, (old_decoded, _, _) = self._entries.popitem(last=False)
+                self._discard_uid_key(old_decoded.get('uid'), old_key)
+                self.evictions += 1
+
+    def invalidate_uid(self, uid):
+        """Drop every cached token for a user (revocation, disable, delete)"""
+        with self._lock:
+            for key in self._keys_by_uid.pop(uid, set()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_uid.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _remove(self, key, uid):
+        self._entries.pop(key, None)
+        self._discard_uid_key(uid, key)
+
+    def _discard_uid_key(self, uid, key):
+        keys = self._keys_by_uid.get(uid)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_uid[uid]